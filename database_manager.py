@@ -6,10 +6,24 @@ Provides direct SQLite database access without gRPC
 import sqlite3
 import os
 import hashlib
+import functools
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from db_config import DB_CONFIG
 
+# Bump whenever _init_database changes; stored in PRAGMA user_version so an
+# up-to-date database skips the schema/migration pass entirely
+SCHEMA_VERSION = 2
+
+
+@functools.lru_cache(maxsize=4096)
+def generate_url_hash(url: str) -> str:
+    """Generate a hash for a URL to detect duplicates (memoized)"""
+    if not url:
+        return ""
+    # Use SHA-256 hash of the URL
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]  # Use first 16 chars for shorter hash
+
 
 class DatabaseManager:
     def __init__(self, db_path: Optional[str] = None):
@@ -28,12 +42,17 @@ class DatabaseManager:
         
         # Initialize database schema
         self._init_database()
+        self._queries_fts = self._has_queries_fts()
     
     def _init_database(self):
         """Initialize database schema if it doesn't exist"""
         with DB_CONFIG.get_connection() as conn:
             cursor = conn.cursor()
             
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] == SCHEMA_VERSION:
+                return
+            
             # Create products table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS products (
@@ -95,22 +114,26 @@ class DatabaseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_scraped_at ON products (scraped_at)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_url_hash ON products (url_hash)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_product_queries_product_id ON product_queries (product_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_product_queries_query_id ON product_queries (query_id)")
+            # Covering index for the queries -> product_queries -> products join;
+            # it supersedes the old single-column query_id index
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_product_queries_query_product ON product_queries (query_id, product_id)")
+            cursor.execute("DROP INDEX IF EXISTS idx_product_queries_query_id")
+            
+            # Read the products schema once instead of probing with failing ALTERs
+            cursor.execute("SELECT name FROM pragma_table_info('products')")
+            product_columns = {row[0] for row in cursor}
             
             # Migration: Add image_url column if it doesn't exist
-            try:
+            if 'image_url' not in product_columns:
                 cursor.execute("ALTER TABLE products ADD COLUMN image_url TEXT")
-            except sqlite3.OperationalError:
-                # Column already exists, continue
-                pass
             
             # Migration: Add url_hash column if it doesn't exist
-            try:
-                cursor.execute("ALTER TABLE products ADD COLUMN url_hash TEXT UNIQUE")
-                print("Added url_hash column to products table")
-            except sqlite3.OperationalError:
-                # Column already exists, continue
-                pass
+            if 'url_hash' not in product_columns:
+                try:
+                    cursor.execute("ALTER TABLE products ADD COLUMN url_hash TEXT UNIQUE")
+                    print("Added url_hash column to products table")
+                except sqlite3.OperationalError as e:
+                    print(f"Could not add url_hash column: {e}")
             
             # Migration: Populate url_hash for existing products
             cursor.execute("SELECT id, link FROM products WHERE url_hash IS NULL")
@@ -127,46 +150,91 @@ class DatabaseManager:
                         # We could handle this by removing the duplicate, but for now just skip
                         pass
             
+            # Trigram full-text index over query text, kept in sync by triggers, so
+            # suggestions read only matching queries (FTS5 trigram needs SQLite 3.34+)
+            try:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'queries_fts'")
+                if cursor.fetchone() is None:
+                    cursor.execute("""
+                        CREATE VIRTUAL TABLE queries_fts USING fts5(
+                            query_text, content='queries', content_rowid='id', tokenize='trigram'
+                        )
+                    """)
+                    cursor.execute("INSERT INTO queries_fts (queries_fts) VALUES ('rebuild')")
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS queries_fts_ai AFTER INSERT ON queries BEGIN
+                        INSERT INTO queries_fts (rowid, query_text) VALUES (new.id, new.query_text);
+                    END
+                """)
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS queries_fts_ad AFTER DELETE ON queries BEGIN
+                        INSERT INTO queries_fts (queries_fts, rowid, query_text)
+                        VALUES ('delete', old.id, old.query_text);
+                    END
+                """)
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS queries_fts_au AFTER UPDATE ON queries BEGIN
+                        INSERT INTO queries_fts (queries_fts, rowid, query_text)
+                        VALUES ('delete', old.id, old.query_text);
+                        INSERT INTO queries_fts (rowid, query_text) VALUES (new.id, new.query_text);
+                    END
+                """)
+            except sqlite3.OperationalError as e:
+                print(f"Query search index unavailable, suggestions will scan all queries: {e}")
+            
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             conn.commit()
     
+    def _has_queries_fts(self) -> bool:
+        """Check whether the trigram index over query text exists"""
+        with DB_CONFIG.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'queries_fts'")
+            return cursor.fetchone() is not None
+    
     def _generate_url_hash(self, url: str) -> str:
         """Generate a hash for a URL to detect duplicates"""
-        if not url:
-            return ""
-        # Use SHA-256 hash of the URL
-        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]  # Use first 16 chars for shorter hash
+        return generate_url_hash(url)
     
     def get_duplicate_statistics(self) -> Dict[str, int]:
         """Get statistics about duplicate URLs in the database"""
         with DB_CONFIG.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Count products with same URL hash
+            # Count duplicate groups and the products in them, plus total
+            # products and unique URLs, all aggregated in SQL
             cursor.execute("""
-                SELECT url_hash, COUNT(*) as count
-                FROM products 
-                WHERE url_hash IS NOT NULL AND url_hash != ''
-                GROUP BY url_hash
-                HAVING COUNT(*) > 1
-                ORDER BY count DESC
+                SELECT (SELECT COUNT(*) FROM products),
+                       (SELECT COUNT(DISTINCT NULLIF(url_hash, '')) FROM products),
+                       COUNT(*),
+                       COALESCE(SUM(count), 0)
+                FROM (
+                    SELECT COUNT(*) as count
+                    FROM products 
+                    WHERE url_hash IS NOT NULL AND url_hash != ''
+                    GROUP BY url_hash
+                    HAVING COUNT(*) > 1
+                )
             """)
-            
-            duplicates = cursor.fetchall()
-            
-            # Count total products and unique URLs
-            cursor.execute("SELECT COUNT(*) FROM products")
-            total_products = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT url_hash) FROM products WHERE url_hash IS NOT NULL AND url_hash != ''")
-            unique_urls = cursor.fetchone()[0]
+            total_products, unique_urls, duplicate_groups, total_duplicates = cursor.fetchone()
             
             return {
                 'total_products': total_products,
                 'unique_urls': unique_urls,
-                'duplicate_groups': len(duplicates),
-                'total_duplicates': sum(count for _, count in duplicates) if duplicates else 0
+                'duplicate_groups': duplicate_groups,
+                'total_duplicates': total_duplicates
             }
     
+    def get_data_version(self) -> int:
+        """
+        Get the data version of this thread's connection
+        
+        Returns:
+            A number that changes whenever another connection commits to the database
+        """
+        with DB_CONFIG.get_connection() as conn:
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+    
     def get_all_products(self) -> List[Dict[str, Any]]:
         """
         Get all products from the database
@@ -250,41 +318,54 @@ class DatabaseManager:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
+            pattern = f"%{search_term}%"
+            # The trigram index finds the queries containing the term without scanning them
+            # all; the plain LIKE still decides the match, so results are unchanged. Terms
+            # holding LIKE wildcards are left to the plain scan
+            query_filter = "q.query_text LIKE ?"
+            params = (pattern,)
+            if self._queries_fts and len(search_term) >= 3 and not any(ch in search_term for ch in "%_"):
+                query_filter += " AND q.id IN (SELECT rowid FROM queries_fts WHERE query_text LIKE ?)"
+                params = (pattern, pattern)
+            
             # Find matching queries, then get all products linked to those queries
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT DISTINCT p.*, q.query_text
                 FROM products p
                 INNER JOIN product_queries pq ON p.id = pq.product_id
                 INNER JOIN queries q ON pq.query_id = q.id
-                WHERE q.query_text LIKE ?
+                WHERE {query_filter}
                 ORDER BY q.query_text, p.scraped_at DESC
-            """, (f"%{search_term}%",))
+            """, params)
             
             rows = cursor.fetchall()
             products = [dict(row) for row in rows]
             
             # If no results found using junction table, fallback to direct query_id lookup
             if not products:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT p.*, q.query_text
                     FROM products p
                     INNER JOIN queries q ON p.query_id = q.id
-                    WHERE q.query_text LIKE ?
+                    WHERE {query_filter}
                     ORDER BY q.query_text, p.scraped_at DESC
-                """, (f"%{search_term}%",))
+                """, params)
                 
                 rows = cursor.fetchall()
                 products = [dict(row) for row in rows]
             
             return products
     
-    def get_fuzzy_query_suggestions(self, search_term: str, limit: int = 10) -> List[str]:
+    def get_fuzzy_query_suggestions(self, search_term: str, limit: Optional[int] = 10,
+                                    candidates: Optional[List[str]] = None) -> List[str]:
         """
         Get fuzzy search suggestions for queries
         
         Args:
             search_term: Partial search term
-            limit: Maximum number of suggestions
+            limit: Maximum number of suggestions, or None for every match
+            candidates: Sorted query strings to match instead of reading the
+                queries table, e.g. the matches of a term this one extends
             
         Returns:
             List of suggested query strings
@@ -294,46 +375,45 @@ class DatabaseManager:
             
         search_term = search_term.lower().strip()
         
-        with DB_CONFIG.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get all unique queries
-            cursor.execute("SELECT DISTINCT query_text FROM queries ORDER BY query_text")
-            all_queries = [row[0] for row in cursor.fetchall()]
-            
-            # Simple fuzzy matching using string similarity
-            suggestions = []
-            
-            # Exact matches first
-            for query in all_queries:
-                if search_term in query.lower():
+        search_words = search_term.split()
+        
+        if candidates is not None:
+            all_queries = candidates
+        else:
+            with DB_CONFIG.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Trigrams can only look up words of 3+ characters
+                if self._queries_fts and all(len(word) >= 3 for word in search_words):
+                    # Queries containing any search word, which is every query that can match
+                    match = " OR ".join('"' + word.replace('"', '""') + '"' for word in search_words)
+                    cursor.execute("""
+                        SELECT DISTINCT query_text FROM queries
+                        WHERE id IN (SELECT rowid FROM queries_fts WHERE queries_fts MATCH ?)
+                        ORDER BY query_text
+                    """, (match,))
+                else:
+                    # Get all unique queries
+                    cursor.execute("SELECT DISTINCT query_text FROM queries ORDER BY query_text")
+                all_queries = [row[0] for row in cursor.fetchall()]
+        
+        # Simple fuzzy matching using string similarity
+        lowered_queries = [(query, query.lower()) for query in all_queries]
+        
+        # Exact matches first
+        suggestions = [query for query, query_lower in lowered_queries if search_term in query_lower]
+        
+        # If we don't have enough exact matches, add partial word matches
+        if limit is None or len(suggestions) < limit:
+            seen = set(suggestions)
+            for query, query_lower in lowered_queries:
+                # A search word (no whitespace) is a prefix of or inside some query
+                # word exactly when it occurs anywhere in the lowered query
+                if query not in seen and any(search_word in query_lower for search_word in search_words):
+                    seen.add(query)
                     suggestions.append(query)
-            
-            # If we don't have enough exact matches, add partial word matches
-            if len(suggestions) < limit:
-                for query in all_queries:
-                    if query not in suggestions:
-                        query_words = query.lower().split()
-                        search_words = search_term.split()
-                        
-                        # Check if any search word is a prefix of any query word
-                        for search_word in search_words:
-                            for query_word in query_words:
-                                if query_word.startswith(search_word) or search_word in query_word:
-                                    suggestions.append(query)
-                                    break
-                            if query in suggestions:
-                                break
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_suggestions = []
-            for suggestion in suggestions:
-                if suggestion not in seen:
-                    seen.add(suggestion)
-                    unique_suggestions.append(suggestion)
-            
-            return unique_suggestions[:limit]
+        
+        return suggestions[:limit]
     
     def get_all_unique_queries(self, limit: int = 50) -> List[str]:
         """
@@ -369,9 +449,17 @@ class DatabaseManager:
         with DB_CONFIG.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Total products
-            cursor.execute("SELECT COUNT(*) FROM products")
-            total_products = cursor.fetchone()[0]
+            # Totals and averages in a single pass over products
+            cursor.execute("""
+                SELECT COUNT(*),
+                       AVG(CASE WHEN price > 0 THEN price END),
+                       AVG(CASE WHEN sentiment_score > 0 THEN sentiment_score END),
+                       COUNT(CASE WHEN sentiment_score > 0 THEN 1 END)
+                FROM products
+            """)
+            total_products, avg_price_result, avg_sentiment_result, products_with_sentiment = cursor.fetchone()
+            avg_price = avg_price_result if avg_price_result else 0
+            avg_sentiment = avg_sentiment_result if avg_sentiment_result else 0
             
             # Products by platform
             cursor.execute("""
@@ -382,20 +470,6 @@ class DatabaseManager:
             """)
             platforms = dict(cursor.fetchall())
             
-            # Average price
-            cursor.execute("SELECT AVG(price) FROM products WHERE price > 0")
-            avg_price_result = cursor.fetchone()[0]
-            avg_price = avg_price_result if avg_price_result else 0
-            
-            # Average sentiment score
-            cursor.execute("SELECT AVG(sentiment_score) FROM products WHERE sentiment_score > 0")
-            avg_sentiment_result = cursor.fetchone()[0]
-            avg_sentiment = avg_sentiment_result if avg_sentiment_result else 0
-            
-            # Products with sentiment analysis
-            cursor.execute("SELECT COUNT(*) FROM products WHERE sentiment_score IS NOT NULL AND sentiment_score > 0")
-            products_with_sentiment = cursor.fetchone()[0]
-            
             return {
                 'total_products': total_products,
                 'platforms': platforms,
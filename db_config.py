@@ -6,6 +6,7 @@ This module provides a single source of truth for database path and reduces sysc
 import os
 import sqlite3
 import threading
+from pathlib import Path
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
 
@@ -44,6 +45,9 @@ def ensure_database_directory() -> str:
 # Global constant for use throughout the application
 DATABASE_PATH = get_database_path()
 
+# PRAGMA optimize mask forcing a full ANALYZE of every table (first run after upgrading)
+FULL_ANALYZE_MASK = 0x10002
+
 
 class DatabaseConfig:
     """
@@ -68,6 +72,8 @@ class DatabaseConfig:
         # Thread-local storage for database connections
         self._local = threading.local()
         self._lock = threading.Lock()
+        self._wal_enabled = False  # journal_mode=WAL persists in the file, so set it once
+        self._ro_connection = None  # shared read-only connection, opened on first use
     
     @property 
     def database_path(self) -> str:
@@ -83,6 +89,74 @@ class DatabaseConfig:
         """Get SQLite connection string with optimizations."""
         return f"file:{self.path}?mode=rwc&cache=shared"
     
+    def _tune(self, conn: sqlite3.Connection, read_only: bool = False):
+        """Apply the per-connection performance PRAGMAs."""
+        if read_only:
+            # Read-only handles cannot change the journal mode; refuse writes outright
+            conn.execute("PRAGMA query_only=1")
+        elif not self._wal_enabled:
+            with self._lock:
+                if not self._wal_enabled:
+                    # Enable WAL mode for better concurrent access
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    self._wal_enabled = True
+        conn.executescript("""
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            PRAGMA temp_store=MEMORY;
+        """)
+    
+    def open_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Open a new tuned connection owned by the caller, for scripts that
+        manage their own connection lifetime.
+        
+        Args:
+            read_only: Open with mode=ro so the connection never takes a write lock.
+        """
+        if read_only:
+            conn = sqlite3.connect(f"{Path(self.path).as_uri()}?mode=ro", uri=True,
+                                   check_same_thread=False, timeout=30.0)
+        else:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+        self._tune(conn, read_only)
+        return conn
+    
+    def get_read_only_connection(self) -> sqlite3.Connection:
+        """
+        Get the process-wide read-only connection, opening it on first use.
+        Its page cache stays warm across callers; it runs in autocommit mode
+        and is closed by close_connections().
+        """
+        if self._ro_connection is None:
+            with self._lock:
+                if self._ro_connection is None:
+                    conn = self.open_connection(read_only=True)
+                    conn.isolation_level = None
+                    self._ro_connection = conn
+        return self._ro_connection
+    
+    def optimize(self, conn: sqlite3.Connection):
+        """Refresh planner statistics; call just before closing a connection."""
+        if conn.execute("PRAGMA query_only").fetchone()[0]:
+            return  # ANALYZE needs write access
+        if os.environ.get('SCRAPQT_FULL_ANALYZE') == '1':
+            conn.execute(f"PRAGMA optimize={FULL_ANALYZE_MASK:#x}")
+        else:
+            conn.execute("PRAGMA optimize")
+    
+    def optimize_database(self):
+        """
+        Refresh planner statistics on a short-lived writable connection, for
+        scripts that only read through the query_only connection.
+        """
+        conn = self.open_connection()
+        try:
+            self.optimize(conn)
+        finally:
+            conn.close()
+    
     @contextmanager
     def get_connection(self):
         """
@@ -96,14 +170,10 @@ class DatabaseConfig:
                 check_same_thread=False,
                 timeout=30.0
             )
-            # Enable WAL mode for better concurrent access
-            self._local.connection.execute("PRAGMA journal_mode=WAL")
             # Enable foreign key constraints
             self._local.connection.execute("PRAGMA foreign_keys=ON")
-            # Optimize for performance
-            self._local.connection.execute("PRAGMA synchronous=NORMAL")
-            self._local.connection.execute("PRAGMA temp_store=MEMORY")
-            self._local.connection.execute("PRAGMA mmap_size=268435456")  # 256MB
+            # Optimize for performance (WAL, 64MB page cache, 256MB mmap)
+            self._tune(self._local.connection)
             
         try:
             yield self._local.connection
@@ -115,8 +185,12 @@ class DatabaseConfig:
     def close_connections(self):
         """Close all thread-local connections."""
         if hasattr(self._local, 'connection') and self._local.connection:
+            self.optimize(self._local.connection)
             self._local.connection.close()
             self._local.connection = None
+        if self._ro_connection is not None:
+            self._ro_connection.close()
+            self._ro_connection = None
 
 
 # Global database configuration instance
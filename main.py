@@ -7,19 +7,84 @@ This is a cleaned up and organized version of the main UI components
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import QLabel, QVBoxLayout, QCompleter, QListWidget, QListWidgetItem, QMessageBox, QScrollArea
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal, Qt
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import QTimer, QThread, QThreadPool, QRunnable, QObject, QMetaObject, Q_ARG, pyqtSignal, pyqtSlot, Qt
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+import time
 import urllib.parse
+from collections import OrderedDict, deque
+from operator import itemgetter
 import webbrowser
 import grpc
 from database_manager import DatabaseManager
+from network_config import get_network_manager, image_request
 from src.scrapqt import services_pb2, services_pb2_grpc
 from sentiment_dialog import SentimentAnalysisDialog
 from product_detail_dialog import ProductDetailDialog
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from pengolahan_data import DataSortingScrapper
+
+# Stylesheets of the image preview label; kept as constants so the label is
+# only re-polished when its style actually changes
+PREVIEW_PLACEHOLDER_STYLE = """
+    QLabel {
+        color: #999;
+        font-size: 12px;
+        font-style: italic;
+    }
+"""
+PREVIEW_LOADING_STYLE = """
+    QLabel {
+        color: #666;
+        font-size: 14px;
+        border: 2px dashed #ccc;
+        border-radius: 8px;
+        background-color: #f9f9f9;
+    }
+"""
+PREVIEW_IMAGE_STYLE = """
+    QLabel {
+        border: 1px solid #ddd;
+        border-radius: 8px;
+        background-color: white;
+    }
+"""
+PREVIEW_ERROR_STYLE = """
+    QLabel {
+        color: #f44336;
+        font-size: 14px;
+        border: 1px solid #ddd;
+        border-radius: 8px;
+        background-color: #f9f9f9;
+    }
+"""
+
+# Stylesheet of the main window's static widgets, set once on the window
+# instead of on each widget; rules use the widgets' object names
+MAIN_WINDOW_STYLE = """
+    QMainWindow {
+        background-color: white;
+    }
+    #header, #header * {
+        background-color: rgb(0, 89, 255);
+    }
+    #scrap_home_logo {
+        border: none;
+    }
+    QLineEdit#search_bar {
+        background-color: rgb(255, 212, 0);
+        color: darkblue;
+        border: 1px solid gray;
+        padding: 5px;
+    }
+    QPushButton#search_button {
+        background-color: rgb(255, 255, 255);
+    }
+    #gambar_produk_title, #grafik_perbandingan_title, #deskripsi_produk_title {
+        font: 87 12pt "Segoe UI Black";
+    }
+"""
+
+_ICON_CACHE = {}  # resource path -> QIcon, so each icon is decoded once
+_SIZE_POLICY_CACHE = {}  # (horizontal, vertical, horizontal stretch) -> QSizePolicy
 
 
 class ScraperWorkerThread(QThread):
@@ -57,14 +122,128 @@ class ScraperWorkerThread(QThread):
             self.scraping_error.emit(self.query, error_msg)
 
 
+class DatabaseThread(QThread):
+    """Event loop thread for DatabaseWorker"""
+
+    def run(self):
+        """Run the event loop from Python so per-thread state lasts as long as the thread"""
+        # When Qt runs the loop natively, every queued slot call gets a fresh Python
+        # thread state, dropping DB_CONFIG's thread-local connection after each query
+        self.exec_()
+
+
+class DatabaseWorker(QObject):
+    """Runs product queries on a background thread so the UI stays responsive"""
+
+    products_loaded = pyqtSignal(list)  # products
+    search_finished = pyqtSignal(str, list)  # search_term, products
+    search_refreshed = pyqtSignal(str, list)  # search_term, products
+    suggestions_found = pyqtSignal(int, str, list)  # lookup number, lowercased term, matches
+    error = pyqtSignal(str)  # error_message
+
+    RESULT_CACHE_SIZE = 32  # Result lists kept for repeated searches
+
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db_manager = db_manager
+
+        # Results by search term (None for every product), valid until another
+        # connection commits; this thread's connection only ever reads
+        self._results = OrderedDict()
+        self._data_version = None
+
+        # Number of the newest suggestion lookup, set by the search bar as it queues
+        # each one; lookups still queued behind a newer one are skipped
+        self.latest_suggestion_seq = 0
+
+    def _cached(self, key, fetch):
+        """Get results from the cache, or fetch them if the database has changed since"""
+        version = self.db_manager.get_data_version()
+        if version != self._data_version:
+            self._results.clear()
+            self._data_version = version
+
+        products = self._results.get(key)
+        if products is None:
+            products = fetch()
+            self._results[key] = products
+            if len(self._results) > self.RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+        return products
+
+    @pyqtSlot()
+    def load_all(self):
+        """Load every product"""
+        try:
+            self.products_loaded.emit(self._cached(None, self.db_manager.get_all_products))
+        except Exception as e:
+            self.error.emit(f"Error loading data from database: {e}")
+
+    @pyqtSlot(str)
+    def search_products(self, search_term):
+        """Find the products linked to queries matching the search term"""
+        try:
+            products = self._cached(search_term, lambda: self.db_manager.search_products(search_term))
+            self.search_finished.emit(search_term, products)
+        except Exception as e:
+            self.error.emit(f"Error searching products: {e}")
+
+    @pyqtSlot(str)
+    def refresh_search(self, search_term):
+        """Re-run a search whose results are already shown"""
+        try:
+            products = self._cached(search_term, lambda: self.db_manager.search_products(search_term))
+            self.search_refreshed.emit(search_term, products)
+        except Exception as e:
+            self.error.emit(f"Error refreshing search results: {e}")
+
+    @pyqtSlot(int, str, str)
+    def suggest(self, seq, text, key):
+        """Find every query matching the search bar text unless newer text was queued since"""
+        if seq != self.latest_suggestion_seq:
+            return
+        try:
+            matches = self.db_manager.get_fuzzy_query_suggestions(text, limit=None)
+            self.suggestions_found.emit(seq, key, matches)
+        except Exception as e:
+            self.error.emit(f"Error looking up suggestions: {e}")
+
+
 class FuzzySearchLineEdit(QtWidgets.QLineEdit):
     """Custom QLineEdit with fuzzy search dropdown functionality"""
 
     suggestion_selected = pyqtSignal(str)
 
+    SUGGESTION_CACHE_SIZE = 128  # Distinct search terms whose suggestions are kept
+    SUGGESTION_DELAY_MS = 300  # Debounce at an ordinary typing pace
+    FAST_TYPING_DELAY_MS = 350  # Longer debounce while the user types in bursts
+    PAUSED_TYPING_DELAY_MS = 120  # Shorter debounce when keystrokes are spaced out
+    FAST_TYPING_INTERVAL = 0.08  # Seconds between keystrokes that count as fast typing
+    PAUSED_TYPING_INTERVAL = 0.2  # Seconds between keystrokes that count as pausing
+    INSTANT_NARROW_MIN = 3  # Narrowable matches needed to skip the debounce
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.db_manager = None
+        self.db_worker = None  # DatabaseWorker running the suggestion lookups
+
+        # LRU cache of suggestions keyed by lowercased search term
+        self._suggestion_cache = OrderedDict()
+        # Most recent queries shown for an empty search bar, loaded on first use
+        self._recent_queries = None
+        # Every match for the last looked-up term, narrowed in memory while the user keeps typing
+        self._last_term = None
+        self._last_matches = None
+        # Recent gaps between keystrokes, used to pick the debounce delay
+        self._last_keystroke_ts = None
+        self._keystroke_intervals = deque(maxlen=3)
+        self._handled_text = None  # Stripped text the last text change acted on
+
+        # Database lookups run on the database worker's thread; each text change
+        # bumps the lookup number so results for older text are discarded
+        self._search_seq = 0
 
         # Create dropdown list
         self.dropdown = QListWidget()
@@ -105,32 +284,83 @@ class FuzzySearchLineEdit(QtWidgets.QLineEdit):
     def set_database_manager(self, db_manager):
         """Set the database manager for fuzzy search"""
         self.db_manager = db_manager
+        self.invalidate()
+
+    def set_database_worker(self, db_worker):
+        """Run suggestion lookups on the worker's thread instead of the GUI thread"""
+        self.db_worker = db_worker
+        db_worker.suggestions_found.connect(self._on_matches_found)
+
+    def invalidate(self):
+        """Drop cached suggestions after the queries table changes"""
+        self._suggestion_cache.clear()
+        self._recent_queries = None
+        self._reset_matches()
+
+    def _reset_matches(self):
+        """Forget the last term's matches so the next lookup reads the database"""
+        self._last_term = None
+        self._last_matches = None
+        self._search_seq += 1  # Results still being looked up are no longer wanted
+
+    def is_current_lookup(self, seq):
+        """Whether a lookup started with this number is still wanted"""
+        return seq == self._search_seq
 
     def _on_text_changed(self, text):
         """Handle text changes with a delay to avoid excessive database calls"""
-        if len(text.strip()) >= 2:  # Start suggesting after 2 characters
-            self.search_timer.start(300)  # 300ms delay
-        elif len(text.strip()) == 0 and self.hasFocus():  # Show all queries when empty and focused
+        self._record_keystroke()
+        text = text.strip()
+        if text == self._handled_text:
+            # Only surrounding whitespace changed; the pending lookup is still right
+            return
+        self._handled_text = text
+        self._search_seq += 1
+        if len(text) >= 2:  # Start suggesting after 2 characters
+            key = text.lower()
+            candidates = self._narrow_candidates(key)
+            if key in self._suggestion_cache or (candidates is not None
+                                                 and len(candidates) >= self.INSTANT_NARROW_MIN):
+                # Answered from memory, so no need to wait
+                self.search_timer.stop()
+                self._update_suggestions()
+            else:
+                self.search_timer.start(self._suggestion_delay())
+        elif len(text) == 0 and self.hasFocus():  # Show all queries when empty and focused
             self._show_all_queries()
         else:
             self.dropdown.hide()
 
+    def _record_keystroke(self):
+        """Remember the time since the previous keystroke"""
+        now = time.monotonic()
+        if self._last_keystroke_ts is not None:
+            self._keystroke_intervals.append(now - self._last_keystroke_ts)
+        self._last_keystroke_ts = now
+
+    def _suggestion_delay(self):
+        """Debounce delay in ms suited to the current typing speed"""
+        if len(self._keystroke_intervals) < self._keystroke_intervals.maxlen:
+            return self.SUGGESTION_DELAY_MS
+        average = sum(self._keystroke_intervals) / len(self._keystroke_intervals)
+        if average < self.FAST_TYPING_INTERVAL:
+            return self.FAST_TYPING_DELAY_MS
+        if average > self.PAUSED_TYPING_INTERVAL:
+            return self.PAUSED_TYPING_DELAY_MS
+        return self.SUGGESTION_DELAY_MS
+
     def _show_all_queries(self):
         """Show all existing queries in the dropdown when search bar is empty and focused"""
         if not self.db_manager:
             return
 
-        # Get all unique queries from database
-        all_queries = self.db_manager.get_all_unique_queries()
-
-        # Clear and populate dropdown
-        self.dropdown.clear()
+        # Get all unique queries from database, once until the queries change
+        if self._recent_queries is None:
+            self._recent_queries = self.db_manager.get_all_unique_queries()
+        all_queries = self._recent_queries
 
         if all_queries:
-            for query in all_queries[:15]:  # Limit to 15 queries to avoid overwhelming dropdown
-                item = QListWidgetItem(query)
-                item.setToolTip(f"Search for: {query}")
-                self.dropdown.addItem(item)
+            self._fill_dropdown(all_queries[:15])  # Limit to 15 queries to avoid overwhelming dropdown
 
             # Position and show dropdown
             self._position_dropdown()
@@ -148,17 +378,45 @@ class FuzzySearchLineEdit(QtWidgets.QLineEdit):
             self.dropdown.hide()
             return
 
-        # Get fuzzy suggestions from database
-        suggestions = self.db_manager.get_fuzzy_query_suggestions(text, limit=8)
+        # Get fuzzy suggestions, from the cache when this term was seen before
+        key = text.lower()
+        suggestions = self._suggestion_cache.get(key)
+        if suggestions is not None:
+            self._suggestion_cache.move_to_end(key)
+            self._show_suggestions(suggestions)
+            return
+
+        candidates = self._narrow_candidates(key)
+        if candidates is not None:
+            # Filtering the previous matches is in memory and quick
+            matches = self.db_manager.get_fuzzy_query_suggestions(text, limit=None, candidates=candidates)
+            self._on_matches_found(self._search_seq, key, matches)
+        elif self.db_worker is not None:
+            # Lookups still queued for older text are skipped by the worker
+            self.db_worker.latest_suggestion_seq = self._search_seq
+            QMetaObject.invokeMethod(self.db_worker, "suggest", Qt.QueuedConnection,
+                                     Q_ARG(int, self._search_seq), Q_ARG(str, text), Q_ARG(str, key))
+        else:
+            matches = self.db_manager.get_fuzzy_query_suggestions(text, limit=None)
+            self._on_matches_found(self._search_seq, key, matches)
+
+    def _on_matches_found(self, seq, key, matches):
+        """Cache and show the matches for a term unless the text has changed since"""
+        if not self.is_current_lookup(seq):
+            return
+        self._last_term = key
+        self._last_matches = sorted(matches)
 
-        # Clear and populate dropdown
-        self.dropdown.clear()
+        suggestions = matches[:8]
+        self._suggestion_cache[key] = suggestions
+        if len(self._suggestion_cache) > self.SUGGESTION_CACHE_SIZE:
+            self._suggestion_cache.popitem(last=False)
+        self._show_suggestions(suggestions)
 
+    def _show_suggestions(self, suggestions):
+        """Show suggestions in the dropdown, hiding it when there are none"""
         if suggestions:
-            for suggestion in suggestions:
-                item = QListWidgetItem(suggestion)
-                item.setToolTip(f"Search for: {suggestion}")
-                self.dropdown.addItem(item)
+            self._fill_dropdown(suggestions)
 
             # Position and show dropdown
             self._position_dropdown()
@@ -166,6 +424,36 @@ class FuzzySearchLineEdit(QtWidgets.QLineEdit):
         else:
             self.dropdown.hide()
 
+    def _fill_dropdown(self, entries):
+        """Show the entries in the dropdown, reusing its existing items"""
+        # Repaint once after the rebuild instead of once per item
+        self.dropdown.setUpdatesEnabled(False)
+        self.dropdown.blockSignals(True)
+        try:
+            for row, entry in enumerate(entries):
+                item = self.dropdown.item(row)
+                if item is None:
+                    item = QListWidgetItem()
+                    self.dropdown.addItem(item)
+                if item.text() != entry:  # Rows often keep their text while the user types
+                    item.setText(entry)
+                    item.setToolTip(f"Search for: {entry}")
+            while self.dropdown.count() > len(entries):
+                self.dropdown.takeItem(self.dropdown.count() - 1)
+            self.dropdown.setCurrentRow(-1)
+        finally:
+            self.dropdown.blockSignals(False)
+            self.dropdown.setUpdatesEnabled(True)
+
+    def _narrow_candidates(self, key):
+        """Get the previous matches when the term only extends the last one, else None"""
+        # Matching is by substring/word prefix, so lengthening the last word can only drop matches
+        if self._last_matches is not None and key.startswith(self._last_term):
+            added = key[len(self._last_term):]
+            if not any(ch.isspace() for ch in added):
+                return self._last_matches
+        return None
+
     def _position_dropdown(self):
         """Position the dropdown below the search bar"""
         pos = self.mapToGlobal(self.rect().bottomLeft())
@@ -177,6 +465,7 @@ class FuzzySearchLineEdit(QtWidgets.QLineEdit):
         suggestion = item.text()
         self.setText(suggestion)
         self.dropdown.hide()
+        self._reset_matches()
         self.suggestion_selected.emit(suggestion)
 
     def keyPressEvent(self, event):
@@ -214,11 +503,191 @@ class FuzzySearchLineEdit(QtWidgets.QLineEdit):
         """Hide dropdown when focus is lost"""
         # Delay hiding to allow for clicking on suggestions
         QTimer.singleShot(200, self.dropdown.hide)
+        self._reset_matches()
         super().focusOutEvent(event)
 
 
-class ProductTableWidget(QtWidgets.QTableWidget):
-    """Custom table widget with image hover preview in main UI"""
+class ImageDecodeTask(QRunnable):
+    """Decodes downloaded image bytes on the thread pool instead of the GUI thread"""
+
+    def __init__(self, table, url, data, target_size=None):
+        super().__init__()
+        self.table = table
+        self.url = url
+        self.data = data
+        self.target_size = target_size  # Also scale for display when given
+
+    def run(self):
+        """Decode the image and report it back to the table"""
+        # QImage can be used off the GUI thread, QPixmap cannot
+        image = QImage()
+        scaled = QImage()
+        if image.loadFromData(self.data) and self.target_size is not None:
+            scaled = image.scaled(self.target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.table.image_decoded.emit(self.url, image, scaled)
+
+
+class ProductTableModel(QtCore.QAbstractTableModel):
+    """Product rows stored as parallel column lists; cell text is formatted on demand"""
+
+    ACTION_COLUMN = 5  # "View" column, opens the product details and is not sortable
+    DISPLAY_CACHE_SCREENS = 4  # Screenfuls of formatted cells kept for repaints
+    COLUMN_FIELDS = itemgetter('title', 'ecommerce', 'review_score', 'price', 'sentiment_score', 'image_url')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = ["Nama Produk", "Platform", "Rating", "Amount", "Sentiment", "Action"]
+        self.products = []
+        self._set_columns()
+        # (row, column) -> formatted text, bounded to a few screenfuls by the view
+        self._display_cache = OrderedDict()
+        self._display_cache_size = self.DISPLAY_CACHE_SCREENS * 20 * len(self.headers)
+
+    def set_visible_rows(self, rows):
+        """Size the formatted-cell cache to the number of rows the view shows"""
+        self._display_cache_size = self.DISPLAY_CACHE_SCREENS * max(1, rows) * len(self.headers)
+        while len(self._display_cache) > self._display_cache_size:
+            self._display_cache.popitem(last=False)
+
+    def _set_columns(self):
+        """Rebuild the column lists from self.products"""
+        # Products come from the database with every column present, so one
+        # itemgetter per row pulls all fields without per-key .get() defaults
+        columns = list(zip(*map(self.COLUMN_FIELDS, self.products))) or [()] * 6
+        (self._titles, self._platforms, self._ratings,
+         self._prices, self._sentiments, image_urls) = columns
+        self.image_urls = [url or '' for url in image_urls]
+        self._sort_keys = {}  # column -> sort key of each row, built on first sort
+
+    def set_products(self, products):
+        """Replace every row with the given products"""
+        self.beginResetModel()
+        self.products = list(products)
+        self._set_columns()
+        self._display_cache.clear()
+        self.endResetModel()
+
+    def product(self, row):
+        """Get the product shown in a row, or None"""
+        return self.products[row] if 0 <= row < len(self.products) else None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.products)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.headers):
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def setHeaderData(self, section, orientation, value, role=Qt.EditRole):
+        if orientation == Qt.Horizontal and role in (Qt.DisplayRole, Qt.EditRole) and 0 <= section < len(self.headers):
+            self.headers[section] = value
+            self.headerDataChanged.emit(orientation, section, section)
+            return True
+        return False
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            # Only cells that get painted are formatted, and repaints reuse the text
+            key = (index.row(), index.column())
+            text = self._display_cache.get(key)
+            if text is None:
+                text = self._display_text(*key)
+                self._display_cache[key] = text
+                if len(self._display_cache) > self._display_cache_size:
+                    self._display_cache.popitem(last=False)
+            else:
+                self._display_cache.move_to_end(key)
+            return text
+        if role == Qt.UserRole:
+            return self._sort_key(index.row(), index.column())
+        return None
+
+    def _display_text(self, row, column):
+        """Format one cell"""
+        if column == 0:
+            return self._titles[row]
+        if column == 1:
+            return self._platforms[row]
+        if column == 2:
+            rating = self._ratings[row]
+            return f"{rating:.1f}" if rating else "N/A"
+        if column == 3:
+            price = self._prices[row]
+            return f"${price:.2f}" if price and price > 0 else "N/A"
+        if column == 4:
+            # Sentiment scores are normalized from -1 (very negative) to 1 (very positive)
+            sentiment = self._sentiments[row]
+            if sentiment is None:
+                return "Unanalyzed"
+            if sentiment >= 0.3:
+                return f"Positive ({sentiment:.2f})"
+            if sentiment >= -0.3:
+                return f"Neutral ({sentiment:.2f})"
+            return f"Negative ({sentiment:.2f})"
+        return "View"
+
+    def _sort_key(self, row, column):
+        """Value a cell sorts by; missing numbers sort to the bottom"""
+        if column == 0:
+            return self._titles[row] or ''
+        if column == 1:
+            return self._platforms[row] or ''
+        if column == 2:
+            return self._ratings[row] or -1
+        if column == 3:
+            price = self._prices[row]
+            return price if price and price > 0 else -1
+        if column == 4:
+            sentiment = self._sentiments[row]
+            return sentiment if sentiment is not None else -999
+        return 0
+
+    def _column_sort_keys(self, column):
+        """Sort keys of every row in a column, computed once per column"""
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            keys = [self._sort_key(row, column) for row in range(len(self.products))]
+            self._sort_keys[column] = keys
+        return keys
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder the rows by a column's sort key"""
+        if column == self.ACTION_COLUMN or not 0 <= column < len(self.headers):
+            return
+        self.layoutAboutToBeChanged.emit()
+        keys = self._column_sort_keys(column)
+        new_order = sorted(range(len(self.products)), key=keys.__getitem__,
+                           reverse=order == Qt.DescendingOrder)
+        new_row = {old: new for new, old in enumerate(new_order)}
+        self.products = [self.products[row] for row in new_order]
+        sort_keys = self._sort_keys
+        self._set_columns()
+        # Carry the keys already built over to the new row order
+        self._sort_keys = {col: [col_keys[row] for row in new_order] for col, col_keys in sort_keys.items()}
+        self._display_cache.clear()
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            old_indexes, [self.index(new_row[index.row()], index.column()) for index in old_indexes])
+        self.layoutChanged.emit()
+
+
+class ProductTableView(QtWidgets.QTableView):
+    """Custom table view with image hover preview in main UI"""
+
+    image_decoded = pyqtSignal(str, QImage, QImage)  # url, image, image scaled for display
+
+    PIXMAP_CACHE_SIZE = 64  # Decoded preview images kept, shared by all tables
+    PREFETCH_ROWS = 12  # Visible rows whose images are fetched ahead of hovering
+    MAX_INFLIGHT = 4  # Concurrent image loads per table; one slot is kept for the hovered image
+    SCALED_CACHE_SIZE = 16  # Images kept scaled to the label's current size
+    _pixmap_cache = OrderedDict()  # image URL -> QPixmap, least recently used first
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -228,41 +697,67 @@ class ProductTableWidget(QtWidgets.QTableWidget):
 
         self.current_hover_row = -1
         self.current_image_url = ""
+        self._image_urls = []  # Image URL of each row, set by the parent
         self.setMouseTracking(True)
 
         # Reference to the main image label (will be set by parent)
         self.image_display_label = None
 
-        # Network manager for loading images
-        self.network_manager = QNetworkAccessManager()
-        self.network_manager.finished.connect(self._on_image_loaded)
+        # Application-wide network manager for loading images
+        self.network_manager = get_network_manager()
         self.current_reply = None
+        self._decoding_url = None  # Hovered image being decoded in the background
+        # (url, width, height) -> QPixmap already scaled for the display label
+        self._scaled_cache = OrderedDict()
+        self.image_decoded.connect(self._on_image_decoded)
+
+        # Background loads of visible rows' images, keyed by image URL,
+        # and the URLs waiting for a free slot
+        self._prefetch_replies = {}
+        self._pending_prefetch = deque()
+        self.prefetch_timer = QTimer()
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self.prefetch_visible)
+        self.verticalScrollBar().valueChanged.connect(lambda: self.prefetch_timer.start(150))
 
     def set_image_display_label(self, label):
         """Set the QLabel where images should be displayed"""
         self.image_display_label = label
+        label.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        """Drop scaled images once the display label changes size"""
+        if obj is self.image_display_label and event.type() == QtCore.QEvent.Resize:
+            self._scaled_cache.clear()
+        return super().eventFilter(obj, event)
 
     def mouseMoveEvent(self, event):
         """Handle mouse move to show/hide image preview"""
         super().mouseMoveEvent(event)
 
-        item = self.itemAt(event.pos())
-        if item:
-            row = item.row()
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            row = index.row()
             if row != self.current_hover_row:
                 self.current_hover_row = row
                 # Get image URL for this row
                 self.current_image_url = self._get_image_url_for_row(row)
 
                 if self.current_image_url and self.image_display_label:
-                    # Start timer to show image after a short delay
-                    self.hover_timer.start(200)  # 200ms delay
+                    if self.current_image_url in self._pixmap_cache:
+                        # Already loaded - show it right away
+                        self.hover_timer.stop()
+                        self._show_image_preview()
+                    else:
+                        # Start timer to show image after a short delay
+                        self.hover_timer.start(200)  # 200ms delay
                 else:
                     self.hover_timer.stop()
         else:
             if self.current_hover_row != -1:
                 self.current_hover_row = -1
                 self.hover_timer.stop()
+                self._cancel_current_reply()
                 # Reset to placeholder when not hovering
                 self._reset_image_display()
 
@@ -271,97 +766,174 @@ class ProductTableWidget(QtWidgets.QTableWidget):
         super().leaveEvent(event)
         self.hover_timer.stop()
         self.current_hover_row = -1
+        self._cancel_current_reply()
         self._reset_image_display()
 
     def _show_image_preview(self):
         """Load and show the image preview in the main UI"""
         if self.current_image_url and self.current_hover_row >= 0 and self.image_display_label:
             # Cancel any ongoing request
-            if self.current_reply:
-                self.current_reply.abort()
+            self._cancel_current_reply()
+
+            # Previously loaded images are shown straight from the cache
+            pixmap = self._pixmap_cache.get(self.current_image_url)
+            if pixmap is not None:
+                self._pixmap_cache.move_to_end(self.current_image_url)
+                self._display_pixmap(self.current_image_url, pixmap)
+                return
 
             # Show loading text
             self.image_display_label.setText("Loading image...")
             self.image_display_label.setAlignment(QtCore.Qt.AlignCenter)
-            self.image_display_label.setStyleSheet("""
-                QLabel {
-                    color: #666;
-                    font-size: 14px;
-                    border: 2px dashed #ccc;
-                    border-radius: 8px;
-                    background-color: #f9f9f9;
-                }
-            """)
+            self._set_label_style(PREVIEW_LOADING_STYLE)
 
-            # Load the image
-            request = QNetworkRequest(QtCore.QUrl(self.current_image_url))
-            request.setRawHeader(b"User-Agent", b"Mozilla/5.0 ScrapQT Image Loader")
-            self.current_reply = self.network_manager.get(request)
+            # Take over a prefetch already loading this image, otherwise load it
+            self.current_reply = self._prefetch_replies.pop(self.current_image_url, None)
+            if self.current_reply is None:
+                self.current_reply = self._request_image(self.current_image_url)
+            else:
+                self._dispatch_prefetches()
+
+    def _request_image(self, url, prefetch=False):
+        """Start loading an image through the shared network manager"""
+        request = image_request(url)
+        if prefetch:
+            request.setPriority(QNetworkRequest.LowPriority)
+            request.setAttribute(QNetworkRequest.CacheLoadControlAttribute, QNetworkRequest.PreferCache)
+        reply = self.network_manager.get(request)
+        reply.setProperty("image_url", url)
+        reply.finished.connect(self._on_reply_finished)
+        return reply
+
+    def prefetch_visible(self, limit=None):
+        """Load the images of the rows in view before they are hovered"""
+        first = self.rowAt(0)
+        if first < 0:
+            return
+        last = self.rowAt(self.viewport().height() - 1)
+        if last < 0:
+            last = self.model().rowCount() - 1
+        last = min(last, first + (limit or self.PREFETCH_ROWS) - 1)
+
+        # Rows scrolled out of view are no longer worth loading
+        self._pending_prefetch.clear()
+        for row in range(first, last + 1):
+            url = self._get_image_url_for_row(row)
+            if url and url not in self._pending_prefetch:
+                self._pending_prefetch.append(url)
+        self._dispatch_prefetches()
+
+    def _dispatch_prefetches(self):
+        """Start queued prefetches while fewer than MAX_INFLIGHT - 1 are running"""
+        while self._pending_prefetch and len(self._prefetch_replies) < self.MAX_INFLIGHT - 1:
+            url = self._pending_prefetch.popleft()
+            if (url in self._pixmap_cache or url in self._prefetch_replies
+                    or (self.current_reply and url == self.current_reply.property("image_url"))):
+                continue
+            self._prefetch_replies[url] = self._request_image(url, prefetch=True)
+
+    def _on_reply_finished(self):
+        """Route a finished reply from the shared network manager"""
+        self._on_image_loaded(self.sender())
+
+    def _cancel_current_reply(self):
+        """Abort the in-flight image request so it can no longer update the label"""
+        self._decoding_url = None
+        if self.current_reply:
+            reply = self.current_reply
+            self.current_reply = None
+            reply.abort()
+            reply.deleteLater()
 
     def _on_image_loaded(self, reply):
         """Handle image loading completion"""
-        if not self.image_display_label:
-            reply.deleteLater()
-            return
+        url = reply.property("image_url")
+        if self._prefetch_replies.get(url) == reply:
+            del self._prefetch_replies[url]
+            self._dispatch_prefetches()
+        is_current = reply == self.current_reply
+        if is_current:
+            self.current_reply = None
 
         if reply.error() == QNetworkReply.NoError:
-            image_data = reply.readAll()
-            pixmap = QPixmap()
-            if pixmap.loadFromData(image_data):
-                # Get the current size of the label (accounting for padding)
-                label_size = self.image_display_label.size()
-
-                # Scale the image to fit the label while maintaining aspect ratio
-                # Leave some padding around the image
-                padding = 10
-                target_size = QtCore.QSize(
-                    label_size.width() - padding * 2,
-                    label_size.height() - padding * 2
-                )
+            # Decode on the thread pool; only the hovered image is also scaled for display.
+            # Prefetches, and replies that were cancelled or superseded, are just cached
+            target_size = None
+            if is_current and self.image_display_label:
+                self._decoding_url = url
+                target_size = self._display_target_size()
+            QThreadPool.globalInstance().start(
+                ImageDecodeTask(self, url, bytes(reply.readAll()), target_size))
+        elif is_current and self.image_display_label:
+            self.image_display_label.setText("Image not available")
+            self._set_label_style(PREVIEW_ERROR_STYLE)
 
-                scaled_pixmap = pixmap.scaled(
-                    target_size,
-                    QtCore.Qt.KeepAspectRatio,
-                    QtCore.Qt.SmoothTransformation
-                )
+        reply.deleteLater()
 
-                self.image_display_label.setPixmap(scaled_pixmap)
-                self.image_display_label.setText("")
+    def _on_image_decoded(self, url, image, scaled):
+        """Cache a decoded image and show it if it is still the one wanted"""
+        is_current = url is not None and url == self._decoding_url
+        if is_current:
+            self._decoding_url = None
 
-                # Update stylesheet to maintain the border but remove background for the actual image
-                self.image_display_label.setStyleSheet("""
-                    QLabel {
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        background-color: white;
-                    }
-                """)
-            else:
+        if image.isNull():
+            if is_current and self.image_display_label:
                 self.image_display_label.setText("Failed to load image")
-                self.image_display_label.setStyleSheet("""
-                    QLabel {
-                        color: #f44336; 
-                        font-size: 14px;
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        background-color: #f9f9f9;
-                    }
-                """)
-        else:
-            self.image_display_label.setText("Image not available")
-            self.image_display_label.setStyleSheet("""
-                QLabel {
-                    color: #f44336; 
-                    font-size: 14px;
-                    border: 1px solid #ddd;
-                    border-radius: 8px;
-                    background-color: #f9f9f9;
-                }
-            """)
+                self._set_label_style(PREVIEW_ERROR_STYLE)
+            return
 
-        reply.deleteLater()
-        if self.current_reply == reply:
-            self.current_reply = None
+        pixmap = QPixmap.fromImage(image)
+        self._cache_pixmap(url, pixmap)
+        if is_current and self.image_display_label:
+            self._display_pixmap(url, pixmap, None if scaled.isNull() else QPixmap.fromImage(scaled))
+
+    def _set_label_style(self, style):
+        """Apply a preview style to the display label unless it already has it"""
+        if self.image_display_label.styleSheet() != style:
+            self.image_display_label.setStyleSheet(style)
+
+    def _cache_pixmap(self, url, pixmap):
+        """Remember a decoded image, evicting the least recently used one when full"""
+        if not url:
+            return
+        self._pixmap_cache[url] = pixmap
+        self._pixmap_cache.move_to_end(url)
+        if len(self._pixmap_cache) > self.PIXMAP_CACHE_SIZE:
+            self._pixmap_cache.popitem(last=False)
+
+    def _display_target_size(self):
+        """Size images are scaled to for the display label"""
+        # Get the current size of the label, leaving some padding around the image
+        label_size = self.image_display_label.size()
+        padding = 10
+        return QtCore.QSize(
+            label_size.width() - padding * 2,
+            label_size.height() - padding * 2
+        )
+
+    def _display_pixmap(self, url, pixmap, scaled_pixmap=None):
+        """Scale an image to the display label and show it"""
+        target_size = self._display_target_size()
+        key = (url, target_size.width(), target_size.height())
+        if scaled_pixmap is None:
+            scaled_pixmap = self._scaled_cache.get(key)
+        if scaled_pixmap is None:
+            # Scale the image to fit the label while maintaining aspect ratio
+            scaled_pixmap = pixmap.scaled(
+                target_size,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation
+            )
+        self._scaled_cache[key] = scaled_pixmap
+        self._scaled_cache.move_to_end(key)
+        if len(self._scaled_cache) > self.SCALED_CACHE_SIZE:
+            self._scaled_cache.popitem(last=False)
+
+        self.image_display_label.setPixmap(scaled_pixmap)
+        self.image_display_label.setText("")
+
+        # Update stylesheet to maintain the border but remove background for the actual image
+        self._set_label_style(PREVIEW_IMAGE_STYLE)
 
     def _reset_image_display(self):
         """Reset the image display to placeholder"""
@@ -369,24 +941,31 @@ class ProductTableWidget(QtWidgets.QTableWidget):
             self.image_display_label.clear()
             self.image_display_label.setText("Hover over a product to see its image")
             self.image_display_label.setAlignment(QtCore.Qt.AlignCenter)
-            self.image_display_label.setStyleSheet("""
-                QLabel {
-                    color: #999;
-                    font-size: 12px;
-                    font-style: italic;
-                }
-            """)
+            self._set_label_style(PREVIEW_PLACEHOLDER_STYLE)
 
     def _get_image_url_for_row(self, row):
         """Get the image URL for the specified row"""
-        # This will be set by the parent class
-        if hasattr(self, '_products_data') and row < len(self._products_data):
-            return self._products_data[row].get('image_url', '')
-        return ""
+        return self._image_urls[row] if 0 <= row < len(self._image_urls) else ""
 
-    def set_products_data(self, products):
-        """Set the products data for image URL lookup"""
-        self._products_data = products
+    def resizeEvent(self, event):
+        """Keep the model's formatted-cell cache sized to the visible rows"""
+        super().resizeEvent(event)
+        if self.model() is not None:
+            row_height = max(1, self.verticalHeader().defaultSectionSize())
+            self.model().set_visible_rows(self.viewport().height() // row_height + 1)
+
+    def setModel(self, model):
+        """Use a ProductTableModel, following its rows for image lookups"""
+        super().setModel(model)
+        model.modelReset.connect(self._on_rows_changed)
+        model.layoutChanged.connect(self._on_rows_changed)
+        self._on_rows_changed()
+
+    def _on_rows_changed(self):
+        """Pick up the model's image URLs after it is reloaded or sorted"""
+        self._image_urls = self.model().image_urls
+        # Prefetch once the rows have been laid out
+        self.prefetch_timer.start(150)
 
     def _handle_label_resize(self):
         """Handle image label resize - rescale current image if any"""
@@ -420,6 +999,20 @@ class Ui_MainWindow(object):
         """Initialize the UI with database manager"""
         self.db_manager = DatabaseManager()
         self.scraper_thread = None  # For background scraping operations
+        self._last_products_fingerprint = None  # Identifies the rows currently in the table
+
+        # Product queries run on a persistent background thread
+        self.db_thread = DatabaseThread()
+        self.db_worker = DatabaseWorker(self.db_manager)
+        self.db_worker.moveToThread(self.db_thread)
+        self.db_worker.products_loaded.connect(self._on_products_loaded)
+        self.db_worker.search_finished.connect(self._on_search_finished)
+        self.db_worker.search_refreshed.connect(self._on_search_refreshed)
+        self.db_worker.error.connect(print)
+        self.db_thread.start()
+        app = QtWidgets.QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self._stop_db_thread)
         self.scraping_timer = None  # For scraping animation
         self.scraping_query = ""  # Current scraping query
         self.scraping_dots = 0  # Animation counter
@@ -436,8 +1029,8 @@ class Ui_MainWindow(object):
         # Set the central widget
         MainWindow.setCentralWidget(self.centralwidget)
 
-        # Load initial data
-        self._load_data_from_database()
+        # Load initial data once the event loop has painted the window
+        QTimer.singleShot(0, self._load_data_from_database)
 
     def _setup_main_window(self, MainWindow):
         """Configure the main window properties"""
@@ -445,18 +1038,12 @@ class Ui_MainWindow(object):
         MainWindow.resize(1146, 768)
 
         # Set size policy for responsive design
-        sizePolicy = QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Expanding,
-            QtWidgets.QSizePolicy.Expanding
-        )
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(MainWindow.sizePolicy().hasHeightForWidth())
-        MainWindow.setSizePolicy(sizePolicy)
+        MainWindow.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
 
         # Set minimum size and remove maximum size constraint for unlimited scaling
         MainWindow.setMinimumSize(QtCore.QSize(800, 600))
-        MainWindow.setStyleSheet("QMainWindow { background-color: white; }")
+        MainWindow.setStyleSheet(MAIN_WINDOW_STYLE)
 
     def _setup_main_layout(self):
         """Set up the main layout structure"""
@@ -482,14 +1069,9 @@ class Ui_MainWindow(object):
         """Set up the main content area with header and content sections"""
         # Create content container
         self.content = QtWidgets.QWidget(self.Window)
-        sizePolicy = QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Expanding,
-            QtWidgets.QSizePolicy.Expanding
-        )
-        sizePolicy.setHorizontalStretch(1)  # Give content area stretch priority
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.content.sizePolicy().hasHeightForWidth())
-        self.content.setSizePolicy(sizePolicy)
+        # Give content area stretch priority
+        self.content.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding, 1))
         self.content.setObjectName("content")
 
         # Create main vertical layout for content
@@ -508,17 +1090,10 @@ class Ui_MainWindow(object):
         """Set up the header section with menu, logo, and search"""
         # Create header container
         self.header = QtWidgets.QWidget(self.content)
-        sizePolicy = QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Expanding,
-            QtWidgets.QSizePolicy.Fixed
-        )
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.header.sizePolicy().hasHeightForWidth())
-        self.header.setSizePolicy(sizePolicy)
+        self.header.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
         self.header.setMinimumSize(QtCore.QSize(0, 80))
         self.header.setMaximumSize(QtCore.QSize(16777215, 80))
-        self.header.setStyleSheet("background-color: rgb(0, 89, 255);")
         self.header.setObjectName("header")
 
         # Header layout
@@ -535,16 +1110,9 @@ class Ui_MainWindow(object):
     def _setup_header_content(self):
         """Set up the header content with menu, logo, and search functionality"""
         self.head_content = QtWidgets.QWidget(self.header)
-        sizePolicy = QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Preferred,
-            QtWidgets.QSizePolicy.Expanding
-        )
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.head_content.sizePolicy().hasHeightForWidth())
-        self.head_content.setSizePolicy(sizePolicy)
+        self.head_content.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Expanding))
         self.head_content.setMinimumSize(QtCore.QSize(0, 55))
-        self.head_content.setStyleSheet("QWidget { background-color: rgb(0, 89, 255); }")
         self.head_content.setObjectName("head_content")
 
         # Header layout
@@ -557,23 +1125,36 @@ class Ui_MainWindow(object):
 
         self.gridLayout_4.addWidget(self.head_content, 0, 0, 1, 1)
 
+    @staticmethod
+    def _get_icon(path):
+        """Get the icon for a resource path, loading it on first use"""
+        icon = _ICON_CACHE.get(path)
+        if icon is None:
+            # A file-backed icon decodes the image only when it is first painted,
+            # at the size it is painted at
+            icon = QtGui.QIcon(path)
+            _ICON_CACHE[path] = icon
+        return icon
+
+    @staticmethod
+    def _size_policy(horizontal, vertical, horizontal_stretch=0):
+        """Get a size policy, building each combination once"""
+        key = (horizontal, vertical, horizontal_stretch)
+        policy = _SIZE_POLICY_CACHE.get(key)
+        if policy is None:
+            policy = QtWidgets.QSizePolicy(horizontal, vertical)
+            policy.setHorizontalStretch(horizontal_stretch)
+            _SIZE_POLICY_CACHE[key] = policy
+        return policy
+
     def _add_home_logo(self):
         """Add the main application logo"""
         self.scrap_home_logo = QtWidgets.QPushButton(self.head_content)
-        sizePolicy = QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Minimum,
-            QtWidgets.QSizePolicy.Fixed
-        )
-        sizePolicy.setHorizontalStretch(0)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.scrap_home_logo.sizePolicy().hasHeightForWidth())
-        self.scrap_home_logo.setSizePolicy(sizePolicy)
-        self.scrap_home_logo.setStyleSheet("border: none;")
+        self.scrap_home_logo.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed))
         self.scrap_home_logo.setText("")
 
-        icon5 = QtGui.QIcon()
-        icon5.addPixmap(QtGui.QPixmap(":/resource/ScrapQt.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.scrap_home_logo.setIcon(icon5)
+        self.scrap_home_logo.setIcon(self._get_icon(":/resource/ScrapQt.png"))
         self.scrap_home_logo.setIconSize(QtCore.QSize(200, 100))
         self.scrap_home_logo.setObjectName("scrap_home_logo")
 
@@ -595,35 +1176,18 @@ class Ui_MainWindow(object):
 
         # Search bar with fuzzy search functionality
         self.search_bar = FuzzySearchLineEdit(self.head_content)
-        sizePolicy = QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Expanding,
-            QtWidgets.QSizePolicy.Fixed
-        )
-        sizePolicy.setHorizontalStretch(1)
-        sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.search_bar.sizePolicy().hasHeightForWidth())
-        self.search_bar.setSizePolicy(sizePolicy)
+        self.search_bar.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed, 1))
         self.search_bar.setMinimumSize(QtCore.QSize(200, 0))
-        self.search_bar.setStyleSheet("""
-            QLineEdit {
-                background-color: rgb(255, 212, 0);
-                color: darkblue;
-                border: 1px solid gray;
-                padding: 5px;
-            }
-        """)
         self.search_bar.setText("")
         self.search_bar.setObjectName("search_bar")
         self.horizontalLayout.addWidget(self.search_bar)
 
         # Search button
         self.search_button = QtWidgets.QPushButton(self.head_content)
-        self.search_button.setStyleSheet("background-color: rgb(255, 255, 255);")
         self.search_button.setText("")
 
-        icon6 = QtGui.QIcon()
-        icon6.addPixmap(QtGui.QPixmap(":/resource/Search.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        self.search_button.setIcon(icon6)
+        self.search_button.setIcon(self._get_icon(":/resource/Search.png"))
         self.search_button.setIconSize(QtCore.QSize(25, 25))
         self.search_button.setObjectName("search_button")
         self.horizontalLayout.addWidget(self.search_button)
@@ -814,7 +1378,6 @@ class Ui_MainWindow(object):
         # Product image title
         self.gambar_produk_title = QtWidgets.QLabel(self.product_image_container)
         self.gambar_produk_title.setMaximumSize(QtCore.QSize(16777215, 30))
-        self.gambar_produk_title.setStyleSheet("font: 87 12pt \"Segoe UI Black\";")
         self.gambar_produk_title.setObjectName("gambar_produk_title")
         self.image_layout.addWidget(self.gambar_produk_title)
 
@@ -850,7 +1413,6 @@ class Ui_MainWindow(object):
         # Comparison chart title
         self.grafik_perbandingan_title = QtWidgets.QLabel(self.comparison_chart_container)
         self.grafik_perbandingan_title.setMaximumSize(QtCore.QSize(16777215, 30))
-        self.grafik_perbandingan_title.setStyleSheet("font: 87 12pt \"Segoe UI Black\";")
         self.grafik_perbandingan_title.setObjectName("grafik_perbandingan_title")
         chart_title_layout.addWidget(self.grafik_perbandingan_title)
         chart_title_layout.addStretch()
@@ -937,17 +1499,16 @@ class Ui_MainWindow(object):
 
         self.deskripsi_produk_title = QtWidgets.QLabel(self.table_section)
         self.deskripsi_produk_title.setMaximumSize(QtCore.QSize(16777215, 30))
-        self.deskripsi_produk_title.setStyleSheet("font: 87 12pt \"Segoe UI Black\";")
         self.deskripsi_produk_title.setObjectName("deskripsi_produk_title")
         self.table_layout.addWidget(self.deskripsi_produk_title)
 
     def _setup_product_table(self):
         """Set up the product data table (70% of vertical space)"""
-        self.tabel_produk = ProductTableWidget(self.table_section)
+        self.tabel_produk = ProductTableView(self.table_section)
 
         # Set size policy for table - expanding
-        table_policy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-        self.tabel_produk.setSizePolicy(table_policy)
+        self.tabel_produk.setSizePolicy(
+            self._size_policy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
         self.tabel_produk.setMinimumSize(QtCore.QSize(0, 200))
 
         # Set table styling
@@ -1021,7 +1582,7 @@ class Ui_MainWindow(object):
         self.tabel_produk.customContextMenuRequested.connect(self._show_context_menu)
 
         # Connect cell click events for View button
-        self.tabel_produk.cellClicked.connect(self._handle_cell_click)
+        self.tabel_produk.clicked.connect(self._handle_cell_click)
 
         # Set initial placeholder text for the image label
         self.gambar_produk.clear()
@@ -1098,18 +1659,9 @@ class Ui_MainWindow(object):
 
     def _setup_table_columns(self):
         """Set up table columns and headers"""
-        self.tabel_produk.setColumnCount(6)
-        self.tabel_produk.setRowCount(0)
-
-        # Set column headers
-        headers = [
-            "Nama Produk", "Platform", "Rating",
-            "Amount", "Sentiment", "Action"
-        ]
-
-        for i, header in enumerate(headers):
-            item = QtWidgets.QTableWidgetItem(header)
-            self.tabel_produk.setHorizontalHeaderItem(i, item)
+        # The model holds the column headers and the product rows
+        self.product_model = ProductTableModel(self.tabel_produk)
+        self.tabel_produk.setModel(self.product_model)
 
     def _configure_table_behavior(self):
         """Configure table resizing and scroll behavior"""
@@ -1148,22 +1700,23 @@ class Ui_MainWindow(object):
 
         # Connect fuzzy search functionality
         self.search_bar.set_database_manager(self.db_manager)
+        self.search_bar.set_database_worker(self.db_worker)
         self.search_bar.suggestion_selected.connect(self._handle_suggestion_selected)
 
     def _update_comparison_chart(self, products=None):
         """Generate and display the comparison chart for the current products."""
         try:
-            # If no products provided, try to get products from table
+            # If no products provided, chart the products shown in the table
             if products is None:
-                # Get current search term if any
-                search_term = self.search_bar.text().strip()
-                if search_term:
-                    products = self.db_manager.search_products(search_term)
-                else:
-                    products = self.db_manager.get_all_products()
+                products = self.current_products if hasattr(self, 'current_products') else []
 
             # If we have products, create chart data
             if products and len(products) > 0:
+                # pandas, scipy and matplotlib take a second or more to import, so
+                # load them with the first chart instead of before the window shows
+                from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+                from pengolahan_data import DataSortingScrapper
+
                 data = DataSortingScrapper(products=products)  # Pass products directly
                 chart_type = self.chart_type_dropdown.currentText()
 
@@ -1216,10 +1769,7 @@ class Ui_MainWindow(object):
             search_term = self.search_bar.text().strip()
             if search_term:
                 # Refresh search results
-                products = self.db_manager.search_products(search_term)
-                self._populate_table(products)
-                self._update_comparison_chart(products)  # Refresh chart with products
-                print(f"Manual refresh: {len(products)} products found for '{search_term}'")
+                self._refresh_current_search(search_term)
             else:
                 # Refresh all products
                 self._load_data_from_database()
@@ -1263,25 +1813,24 @@ class Ui_MainWindow(object):
         # Automatically trigger search when suggestion is selected
         self._handle_search()
 
-    def _handle_cell_click(self, row, column):
+    def _handle_cell_click(self, index):
         """Handle cell clicks, specifically for the View button"""
-        if column == 5:  # Action column (View button)
-            if hasattr(self, 'current_products') and row < len(self.current_products):
-                product = self.current_products[row]
+        if index.column() == ProductTableModel.ACTION_COLUMN:  # Action column (View button)
+            product = self.product_model.product(index.row())
+            if product is not None:
                 self._open_product_details(product)
 
     def _show_context_menu(self, position):
         """Show context menu for table items"""
-        item = self.tabel_produk.itemAt(position)
-        if item is None:
+        index = self.tabel_produk.indexAt(position)
+        if not index.isValid():
             return
 
-        row = item.row()
-        if not hasattr(self, 'current_products') or row >= len(self.current_products):
+        # Rows follow the model's sort order, not the order products were loaded in
+        product = self.product_model.product(index.row())
+        if product is None:
             return
 
-        product = self.current_products[row]
-
         # Create context menu
         context_menu = QtWidgets.QMenu(self)
 
@@ -1325,10 +1874,7 @@ class Ui_MainWindow(object):
         search_term = self.search_bar.text().strip()
         if search_term:
             # Refresh search results
-            products = self.db_manager.search_products(search_term)
-            self._populate_table(products)
-            self._update_comparison_chart(products)  # Refresh chart with products
-            print(f"Refreshed search results: {len(products)} products found")
+            self._refresh_current_search(search_term)
         else:
             # Refresh all products
             self._load_data_from_database()
@@ -1393,43 +1939,59 @@ class Ui_MainWindow(object):
         """Handle search button click or Enter key press"""
         search_term = self.search_bar.text().strip()
         if search_term:
-            products = self.db_manager.search_products(search_term)
-
-            if len(products) > 0:
-                # Store current splitter sizes before populating table
-                current_sizes = None
-                if hasattr(self, 'main_splitter'):
-                    current_sizes = self.main_splitter.sizes()
-
-                # Found products - display them
-                self._populate_table(products)
-                self._update_comparison_chart(products)  # Pass products instead of search term
-                print(f"Search for '{search_term}': Found {len(products)} products in matching queries")
-
-                # Restore splitter sizes to prevent layout changes
-                if current_sizes and hasattr(self, 'main_splitter'):
-                    self.main_splitter.setSizes(current_sizes)
-
-                # Update image display to show search feedback
-                self.gambar_produk.setText("Hover over a product to see its image")
-                self.gambar_produk.setStyleSheet("""
-                    QLabel {
-                        color: #999;
-                        font-size: 12px;
-                        font-style: italic;
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        background-color: #f9f9f9;
-                    }
-                """)
-            else:
-                # No products found - prompt user to scrape
-                self._prompt_for_scraping(search_term)
-                self._set_chart_placeholder()  # Clear chart
+            # Results arrive in _on_search_finished
+            QMetaObject.invokeMethod(self.db_worker, "search_products", Qt.QueuedConnection,
+                                     Q_ARG(str, search_term))
         else:
             self._load_data_from_database()
             self._set_chart_placeholder()  # Clear chart
 
+    def _on_search_finished(self, search_term, products):
+        """Show the search results produced by the database worker"""
+        if len(products) > 0:
+            # Store current splitter sizes before populating table
+            current_sizes = None
+            if hasattr(self, 'main_splitter'):
+                current_sizes = self.main_splitter.sizes()
+
+            # Found products - display them
+            self._populate_table(products)
+            self._update_comparison_chart(products)  # Pass products instead of search term
+            print(f"Search for '{search_term}': Found {len(products)} products in matching queries")
+
+            # Restore splitter sizes to prevent layout changes
+            if current_sizes and hasattr(self, 'main_splitter'):
+                self.main_splitter.setSizes(current_sizes)
+
+            # Update image display to show search feedback
+            self.gambar_produk.setText("Hover over a product to see its image")
+            self.gambar_produk.setStyleSheet("""
+                QLabel {
+                    color: #999;
+                    font-size: 12px;
+                    font-style: italic;
+                    border: 1px solid #ddd;
+                    border-radius: 8px;
+                    background-color: #f9f9f9;
+                }
+            """)
+        else:
+            # No products found - prompt user to scrape
+            self._prompt_for_scraping(search_term)
+            self._set_chart_placeholder()  # Clear chart
+
+    def _refresh_current_search(self, search_term):
+        """Re-run the shown search in the background"""
+        # Results arrive in _on_search_refreshed
+        QMetaObject.invokeMethod(self.db_worker, "refresh_search", Qt.QueuedConnection,
+                                 Q_ARG(str, search_term))
+
+    def _on_search_refreshed(self, search_term, products):
+        """Show the refreshed results of a search"""
+        self._populate_table(products)
+        self._update_comparison_chart(products)  # Refresh chart with products
+        print(f"Refreshed search results: {len(products)} products found for '{search_term}'")
+
     def _prompt_for_scraping(self, query):
         """Show popup asking if user wants to scrape for the query"""
         # Update image display to show no results
@@ -1529,6 +2091,9 @@ class Ui_MainWindow(object):
 
     def _on_scraping_finished(self, query, items_scraped, success):
         """Handle scraping finished signal"""
+        # The scrape saved a new query, so cached suggestions are stale
+        self.search_bar.invalidate()
+
         # Stop animation timer
         if hasattr(self, 'scraping_timer'):
             self.scraping_timer.stop()
@@ -1679,6 +2244,11 @@ class Ui_MainWindow(object):
             """)
             self._set_chart_placeholder()
 
+    def _stop_db_thread(self):
+        """Stop the database worker thread when the application quits"""
+        self.db_thread.quit()
+        self.db_thread.wait()
+
     def closeEvent(self, event):
         """Handle application closing - cleanup background threads"""
         if self.scraper_thread and self.scraper_thread.isRunning():
@@ -1718,9 +2288,7 @@ class Ui_MainWindow(object):
                     # If we have current search results, refresh them
                     current_query = self.search_bar.text().strip()
                     if current_query:
-                        products = self.db_manager.search_products(current_query)
-                        self._populate_table(products)
-                        print("Product table refreshed with new sentiment scores")
+                        self._refresh_current_search(current_query)
 
         except Exception as e:
             print(f"Error opening sentiment analysis dialog: {e}")
@@ -1854,14 +2422,19 @@ class Ui_MainWindow(object):
                 self.clear_db_button.setText("🗑️ Clear DB")
 
     def _load_data_from_database(self):
-        """Load all products from database and populate table"""
+        """Load all products from database in the background and populate table"""
+        self.search_bar.invalidate()
+        # Results arrive in _on_products_loaded
+        QMetaObject.invokeMethod(self.db_worker, "load_all", Qt.QueuedConnection)
+
+    def _on_products_loaded(self, products):
+        """Populate the table with the products loaded by the database worker"""
         try:
             # Store current splitter sizes before populating table
             current_sizes = None
             if hasattr(self, 'main_splitter'):
                 current_sizes = self.main_splitter.sizes()
 
-            products = self.db_manager.get_all_products()
             self._populate_table(products)
 
             # Restore splitter sizes to prevent layout changes
@@ -1872,88 +2445,30 @@ class Ui_MainWindow(object):
         except Exception as e:
             print(f"Error loading data from database: {e}")
 
+    def _products_fingerprint(self, products):
+        """Hash of everything the table shows for the products"""
+        return hash((tuple(map(itemgetter('id'), products)),
+                     tuple(map(ProductTableModel.COLUMN_FIELDS, products))))
+
     def _populate_table(self, products):
         """Populate the table with product data"""
         # Store products for use in click handlers and other functionality
         self.current_products = products
 
+        # Identical results are already on screen, so skip the rebuild
+        fingerprint = self._products_fingerprint(products)
+        if fingerprint == self._last_products_fingerprint:
+            print(f"Product table unchanged ({len(products)} products), using cached rows")
+            return
+        self._last_products_fingerprint = fingerprint
+
         # Temporarily disable sorting during population to prevent layout issues
         self.tabel_produk.setSortingEnabled(False)
 
-        self.tabel_produk.setRowCount(len(products))
-        # Set products data for image hover functionality
-        self.tabel_produk.set_products_data(products)
-
-        for row, product in enumerate(products):
-            # Product Name
-            name_item = QtWidgets.QTableWidgetItem(product.get('title', ''))
-            self.tabel_produk.setItem(row, 0, name_item)
-
-            # Platform
-            platform_item = QtWidgets.QTableWidgetItem(product.get('ecommerce', ''))
-            self.tabel_produk.setItem(row, 1, platform_item)
-
-            # Rating - create custom item for proper numeric sorting
-            rating = product.get('review_score')
-            if rating:
-                rating_text = f"{rating:.1f}"
-                rating_item = QtWidgets.QTableWidgetItem()
-                rating_item.setText(rating_text)
-                rating_item.setData(QtCore.Qt.DisplayRole, rating_text)
-                rating_item.setData(QtCore.Qt.UserRole, rating)  # Store numeric value for sorting
-            else:
-                rating_item = QtWidgets.QTableWidgetItem()
-                rating_item.setText("N/A")
-                rating_item.setData(QtCore.Qt.DisplayRole, "N/A")
-                rating_item.setData(QtCore.Qt.UserRole, -1)  # N/A values sort to bottom
-            self.tabel_produk.setItem(row, 2, rating_item)
-
-            # Amount (Price) - create custom item for proper numeric sorting
-            price = product.get('price')
-            if price and price > 0:
-                amount_text = f"${price:.2f}"
-                amount_item = QtWidgets.QTableWidgetItem()
-                amount_item.setText(amount_text)
-                amount_item.setData(QtCore.Qt.DisplayRole, amount_text)
-                amount_item.setData(QtCore.Qt.UserRole, price)  # Store numeric value for sorting
-            else:
-                amount_item = QtWidgets.QTableWidgetItem()
-                amount_item.setText("N/A")
-                amount_item.setData(QtCore.Qt.DisplayRole, "N/A")
-                amount_item.setData(QtCore.Qt.UserRole, -1)  # N/A values sort to bottom
-            self.tabel_produk.setItem(row, 3, amount_item)
-
-            # Sentiment - create custom item for proper numeric sorting
-            sentiment = product.get('sentiment_score')
-            if sentiment is not None:
-                # Sentiment scores are normalized from -1 (very negative) to 1 (very positive)
-                if sentiment >= 0.3:
-                    status_text = f"Positive ({sentiment:.2f})"
-                elif sentiment >= -0.3:
-                    status_text = f"Neutral ({sentiment:.2f})"
-                else:
-                    status_text = f"Negative ({sentiment:.2f})"
-
-                status_item = QtWidgets.QTableWidgetItem()
-                status_item.setText(status_text)
-                status_item.setData(QtCore.Qt.DisplayRole, status_text)
-                status_item.setData(QtCore.Qt.UserRole, sentiment)  # Store numeric value for sorting
-            else:
-                status_text = "Unanalyzed"
-                status_item = QtWidgets.QTableWidgetItem()
-                status_item.setText(status_text)
-                status_item.setData(QtCore.Qt.DisplayRole, status_text)
-                status_item.setData(QtCore.Qt.UserRole, -999)  # Unanalyzed sorts to bottom
-
-            self.tabel_produk.setItem(row, 4, status_item)
-
-            # Action (View Link) - make non-sortable
-            action_item = QtWidgets.QTableWidgetItem("View")
-            action_item.setData(QtCore.Qt.UserRole, 0)  # Neutral sort value
-            # Keep default flags but note that sorting is handled by header click handler
-            self.tabel_produk.setItem(row, 5, action_item)
+        # The model keeps the products as columns and formats cells only when they are painted
+        self.product_model.set_products(products)
 
-        # Re-enable sorting after population - Qt will handle click events automatically
+        # Re-enable sorting after population - this re-applies the current sort column
         self.tabel_produk.setSortingEnabled(True)
 
         # Ensure the table maintains its size and splitter proportions
@@ -1995,9 +2510,7 @@ class Ui_MainWindow(object):
         ]
 
         for i, header in enumerate(headers):
-            item = self.tabel_produk.horizontalHeaderItem(i)
-            if item:
-                item.setText(_translate("MainWindow", header))
+            self.product_model.setHeaderData(i, QtCore.Qt.Horizontal, _translate("MainWindow", header))
 
 
 # Import resources
@@ -0,0 +1,46 @@
+"""
+Centralized network configuration for ScrapQT.
+Provides one QNetworkAccessManager for the whole application so image loads
+share Qt's connection pool (keep-alive, TLS sessions) instead of each widget
+starting cold.
+"""
+
+import os
+
+from PyQt5 import QtCore
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkDiskCache, QNetworkRequest
+
+# Default User-Agent for image requests
+IMAGE_USER_AGENT = b"Mozilla/5.0 ScrapQT Image Loader"
+
+# On-disk HTTP cache so loaded and prefetched images survive restarts
+IMAGE_DISK_CACHE_SIZE = 50 * 1024 * 1024  # 50MB
+
+_network_manager = None
+
+
+def get_network_manager() -> QNetworkAccessManager:
+    """
+    Get the application-wide network access manager, creating it on first use.
+
+    Callers connect to each reply's own finished signal rather than the
+    manager's, since the manager is shared.
+    """
+    global _network_manager
+    if _network_manager is None:
+        _network_manager = QNetworkAccessManager()
+        cache = QNetworkDiskCache(_network_manager)
+        cache.setCacheDirectory(os.path.join(
+            QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.CacheLocation), 'images'))
+        cache.setMaximumCacheSize(IMAGE_DISK_CACHE_SIZE)
+        _network_manager.setCache(cache)
+    return _network_manager
+
+
+def image_request(url: str, user_agent: bytes = IMAGE_USER_AGENT) -> QNetworkRequest:
+    """Build a request for a product image."""
+    request = QNetworkRequest(QtCore.QUrl(url))
+    request.setRawHeader(b"User-Agent", user_agent)
+    # Let hosts that support it multiplex image loads over one connection
+    request.setAttribute(QNetworkRequest.Http2AllowedAttribute, True)
+    return request
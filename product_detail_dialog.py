@@ -9,7 +9,8 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QFrame, QGridLayout
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtNetwork import QNetworkReply
+from network_config import get_network_manager, image_request
 
 
 class ProductDetailDialog(QDialog):
@@ -21,8 +22,7 @@ class ProductDetailDialog(QDialog):
     def __init__(self, product_data, parent=None):
         super().__init__(parent)
         self.product_data = product_data
-        self.network_manager = QNetworkAccessManager()
-        self.network_manager.finished.connect(self._on_image_loaded)
+        self.network_manager = get_network_manager()
         self.current_reply = None
         
         self.setWindowTitle(f"Product Details - {product_data.get('title', 'Unknown Product')}")
@@ -297,15 +297,19 @@ class ProductDetailDialog(QDialog):
         image_url = self.product_data.get('image_url')
         if image_url and image_url.strip():
             try:
-                request = QNetworkRequest(QtCore.QUrl(image_url))
-                request.setRawHeader(b"User-Agent", b"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+                request = image_request(image_url, b"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
                 self.current_reply = self.network_manager.get(request)
+                self.current_reply.finished.connect(self._on_reply_finished)
             except Exception as e:
                 print(f"Error loading image: {e}")
                 self.image_label.setText("Image not available")
         else:
             self.image_label.setText("No image available")
     
+    def _on_reply_finished(self):
+        """Route a finished reply from the shared network manager"""
+        self._on_image_loaded(self.sender())
+    
     def _on_image_loaded(self, reply):
         """Handle image loading completion"""
         if reply.error() == QNetworkReply.NoError:
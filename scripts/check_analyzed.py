@@ -7,51 +7,55 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
 from db_config import DB_CONFIG
 
-DATABASE_PATH = DB_CONFIG.database_path
-
 def check_analyzed_sentiment():
     """Check which products got sentiment analysis"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = DB_CONFIG.get_read_only_connection()
     cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    # Run every read against one snapshot instead of locking per statement
+    cursor.execute("BEGIN")
+    # Collect the report and write it once at the end
+    out = []
     
-    print("Recently analyzed products (sentiment 1-10):")
-    print("=" * 60)
+    out.append("Recently analyzed products (sentiment 1-10):")
+    out.append("=" * 60)
     
     # Get products with analyzed sentiments
     cursor.execute("""
-        SELECT id, title, sentiment_score, query_id, scraped_at 
+        SELECT id, substr(title, 1, 50) AS title_short, sentiment_score, query_id
         FROM products 
         WHERE sentiment_score >= 1 AND sentiment_score <= 10
         ORDER BY scraped_at DESC 
         LIMIT 10
     """)
     
-    products = cursor.fetchall()
-    
-    for product_id, title, sentiment_score, query_id, scraped_at in products:
-        print(f"ID: {product_id}, Title: {title[:50]}..., Sentiment: {sentiment_score}, Query ID: {query_id}")
+    for row in cursor:
+        out.append(f"ID: {row['id']}, Title: {row['title_short']}..., Sentiment: {row['sentiment_score']}, Query ID: {row['query_id']}")
     
     # Check if any products have descriptions
-    print("\nProducts that were analyzed (description check):")
-    print("=" * 60)
+    out.append("\nProducts that were analyzed (description check):")
+    out.append("=" * 60)
     cursor.execute("""
-        SELECT id, title, description, sentiment_score
+        SELECT id, title, substr(description, 1, 100) AS desc_short,
+               COALESCE(length(description), 0) AS desc_len, sentiment_score
         FROM products 
         WHERE sentiment_score >= 1 AND sentiment_score <= 10
         LIMIT 5
     """)
     
-    products_with_desc = cursor.fetchall()
-    
-    for product_id, title, description, sentiment_score in products_with_desc:
-        desc_preview = (description[:100] + "...") if description and len(description) > 100 else (description or "No description")
-        print(f"ID: {product_id}")
-        print(f"  Title: {title}")
-        print(f"  Description: {desc_preview}")
-        print(f"  Sentiment: {sentiment_score}")
-        print()
+    for row in cursor:
+        desc_preview = (row['desc_short'] + "...") if row['desc_len'] > 100 else (row['desc_short'] or "No description")
+        out.append(f"ID: {row['id']}")
+        out.append(f"  Title: {row['title']}")
+        out.append(f"  Description: {desc_preview}")
+        out.append(f"  Sentiment: {row['sentiment_score']}")
+        out.append("")
     
-    conn.close()
+    cursor.execute("COMMIT")
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     check_analyzed_sentiment()
+    # The report reads through the query_only connection, which cannot ANALYZE
+    DB_CONFIG.optimize_database()
+    DB_CONFIG.close_connections()
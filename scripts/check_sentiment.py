@@ -1,4 +1,3 @@
-import sqlite3
 import sys
 import os
 
@@ -7,15 +6,17 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
 from db_config import DB_CONFIG
 
-DATABASE_PATH = DB_CONFIG.database_path
-
 def check_sentiment_scores():
     """Check the sentiment scores in the database"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = DB_CONFIG.get_read_only_connection()
     cursor = conn.cursor()
+    # Run every read against one snapshot instead of locking per statement
+    cursor.execute("BEGIN")
+    # Collect the report and write it once at the end
+    out = []
     
-    print("Checking sentiment scores in the database...")
-    print("=" * 50)
+    out.append("Checking sentiment scores in the database...")
+    out.append("=" * 50)
     
     # Get all products with their sentiment scores
     cursor.execute("""
@@ -25,29 +26,30 @@ def check_sentiment_scores():
         LIMIT 15
     """)
     
-    products = cursor.fetchall()
-    
-    for product_id, title, sentiment_score, query_id, scraped_at in products:
+    for product_id, title, sentiment_score, query_id, scraped_at in cursor:
         sentiment_status = "NULL (unanalyzed)" if sentiment_score is None else f"{sentiment_score} (analyzed)"
-        print(f"ID: {product_id}, Title: {title[:40]}..., Sentiment: {sentiment_status}, Query ID: {query_id}")
-    
-    # Count by sentiment status
-    cursor.execute("SELECT COUNT(*) FROM products WHERE sentiment_score IS NULL")
-    unanalyzed_count = cursor.fetchone()[0]
+        out.append(f"ID: {product_id}, Title: {title[:40]}..., Sentiment: {sentiment_status}, Query ID: {query_id}")
     
-    cursor.execute("SELECT COUNT(*) FROM products WHERE sentiment_score IS NOT NULL AND sentiment_score > 0")
-    analyzed_count = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM products WHERE sentiment_score = 0")
-    zero_count = cursor.fetchone()[0]
+    # Count by sentiment status in a single pass over products
+    cursor.execute("""
+        SELECT COUNT(CASE WHEN sentiment_score IS NULL THEN 1 END),
+               COUNT(CASE WHEN sentiment_score > 0 THEN 1 END),
+               COUNT(CASE WHEN sentiment_score = 0 THEN 1 END)
+        FROM products
+    """)
+    unanalyzed_count, analyzed_count, zero_count = cursor.fetchone()
     
-    print("\n" + "=" * 50)
-    print(f"Summary:")
-    print(f"  Unanalyzed (NULL): {unanalyzed_count}")
-    print(f"  Analyzed (1-10): {analyzed_count}")
-    print(f"  Zero scores: {zero_count}")
+    out.append("\n" + "=" * 50)
+    out.append(f"Summary:")
+    out.append(f"  Unanalyzed (NULL): {unanalyzed_count}")
+    out.append(f"  Analyzed (1-10): {analyzed_count}")
+    out.append(f"  Zero scores: {zero_count}")
     
-    conn.close()
+    cursor.execute("COMMIT")
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     check_sentiment_scores()
+    # The report reads through the query_only connection, which cannot ANALYZE
+    DB_CONFIG.optimize_database()
+    DB_CONFIG.close_connections()
@@ -7,7 +7,7 @@ import sqlite3
 from dotenv import load_dotenv
 import signal
 import sys
-import hashlib
+from itertools import islice
 
 # Add the project root to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -15,9 +15,20 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 from src.scrapqt import services_pb2
 from src.scrapqt import services_pb2_grpc
 from db_config import DB_CONFIG
+from database_manager import generate_url_hash
 
 DATABASE_PATH = DB_CONFIG.database_path
 
+# Items per url_hash IN (...) lookup; stays under SQLite's 999 bound-parameter limit
+SAVE_ITEMS_BATCH_SIZE = 500
+
+# SaveItems statements, kept as fixed text so sqlite3's statement cache reuses the compiled plans
+INSERT_PRODUCT_SQL = """
+    INSERT INTO products (title, price, review_score, review_count, link, ecommerce, is_used, sentiment_score, description, query_id, image_url, url_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+LINK_PRODUCT_SQL = "INSERT OR IGNORE INTO product_queries (product_id, query_id) VALUES (?, ?)"
+
 def init_db():
     """Initializes the database and creates the products table if it doesn't exist."""
     # Directory creation is already handled by DB_CONFIG
@@ -282,58 +293,57 @@ class SentimentServicer(services_pb2_grpc.SentimentServicer):
 
     def _generate_url_hash(self, url: str) -> str:
         """Generate a hash for a URL to detect duplicates"""
-        if not url:
-            return ""
-        # Use SHA-256 hash of the URL
-        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]  # Use first 16 chars for shorter hash
+        return generate_url_hash(url)
 
-    def _link_product_to_query(self, conn: sqlite3.Connection, product_id: int, query_id: int):
+    def _link_product_to_query(self, cursor: sqlite3.Cursor, product_id: int, query_id: int):
         """Link a product to a query in the junction table"""
-        cursor = conn.cursor()
         try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO product_queries (product_id, query_id)
-                VALUES (?, ?)
-            """, (product_id, query_id))
+            cursor.execute(LINK_PRODUCT_SQL, (product_id, query_id))
         except sqlite3.Error as e:
             print(f"Error linking product {product_id} to query {query_id}: {e}")
 
     def SaveItems(self, request_iterator, context):
         """Receives a stream of scraped items and saves them to the database, avoiding duplicates."""
         print("LLM service received request to save items.")
-        conn = sqlite3.connect(DATABASE_PATH)
+        conn = sqlite3.connect(DATABASE_PATH, cached_statements=256)
         cursor = conn.cursor()
         item_count = 0
         duplicate_count = 0
         
         try:
-            for item in request_iterator:
-                url_hash = self._generate_url_hash(item.link)
+            items = iter(request_iterator)
+            while True:
+                batch = list(islice(items, SAVE_ITEMS_BATCH_SIZE))
+                if not batch:
+                    break
+                hashes = [self._generate_url_hash(item.link) for item in batch]
                 
-                # Check if product with this URL hash already exists
-                cursor.execute("SELECT id FROM products WHERE url_hash = ?", (url_hash,))
-                existing_product = cursor.fetchone()
+                # Look up every url_hash in the batch with a single query
+                unique_hashes = list(dict.fromkeys(hashes))
+                placeholders = ",".join("?" * len(unique_hashes))
+                cursor.execute(f"SELECT url_hash, id FROM products WHERE url_hash IN ({placeholders})", unique_hashes)
+                existing_ids = dict(cursor.fetchall())
                 
-                if existing_product:
-                    # Product already exists - just link it to the current query
-                    existing_product_id = existing_product[0]
-                    self._link_product_to_query(conn, existing_product_id, item.query_id)
-                    duplicate_count += 1
-                    print(f"Found duplicate URL: {item.link} - linked to query {item.query_id}")
-                else:
-                    # New product - insert it
-                    # Convert sentiment_score of 0 to None (NULL in database) for unanalyzed items
-                    sentiment_value = None if item.sentiment_score == 0 else item.sentiment_score
-                    
-                    cursor.execute("""
-                        INSERT INTO products (title, price, review_score, review_count, link, ecommerce, is_used, sentiment_score, description, query_id, image_url, url_hash)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (item.title, item.price, item.review_score, item.review_count, item.link, item.ecommerce, item.is_used, sentiment_value, item.description, item.query_id, item.image_url, url_hash))
+                for item, url_hash in zip(batch, hashes):
+                    existing_product_id = existing_ids.get(url_hash)
                     
-                    # Get the newly inserted product ID and link to query
-                    new_product_id = cursor.lastrowid
-                    self._link_product_to_query(conn, new_product_id, item.query_id)
-                    item_count += 1
+                    if existing_product_id is not None:
+                        # Product already exists - just link it to the current query
+                        self._link_product_to_query(cursor, existing_product_id, item.query_id)
+                        duplicate_count += 1
+                        print(f"Found duplicate URL: {item.link} - linked to query {item.query_id}")
+                    else:
+                        # New product - insert it
+                        # Convert sentiment_score of 0 to None (NULL in database) for unanalyzed items
+                        sentiment_value = None if item.sentiment_score == 0 else item.sentiment_score
+                        
+                        cursor.execute(INSERT_PRODUCT_SQL, (item.title, item.price, item.review_score, item.review_count, item.link, item.ecommerce, item.is_used, sentiment_value, item.description, item.query_id, item.image_url, url_hash))
+                        
+                        # Get the newly inserted product ID and link to query
+                        new_product_id = cursor.lastrowid
+                        existing_ids[url_hash] = new_product_id  # later repeats in this stream are duplicates
+                        self._link_product_to_query(cursor, new_product_id, item.query_id)
+                        item_count += 1
                     
             conn.commit()
             print(f"Successfully saved {item_count} new items and linked {duplicate_count} existing items to queries.")
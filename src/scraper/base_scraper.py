@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 class BaseScraper(ABC):
     """
@@ -13,7 +14,7 @@ class BaseScraper(ABC):
         pass
 
     @abstractmethod
-    def scrape(self, query: str) -> list[dict]:
+    def scrape(self, query: str) -> Iterable[dict]:
         """
         Scrapes the e-commerce platform for a given query.
 
@@ -21,6 +22,14 @@ class BaseScraper(ABC):
             query: The search query.
 
         Returns:
-            A list of dictionaries, where each dictionary represents a scraped item.
+            An iterable of dictionaries (a list or a generator), where each
+            dictionary represents a scraped item.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Releases any resources the scraper holds, such as browser processes.
+        Called once when the scraper server shuts down.
         """
         pass
@@ -88,9 +88,8 @@ def scrape_and_save_linked_queries(primary_query_id, primary_query_text, db_stub
             conn.close()
 
             print(f"  Scraping linked query: '{linked_query_text}' (Relationship: {relationship_type})")
-            item_list = list(generate_scraped_items(loaded_plugins, linked_query_text, primary_query_id)) # Removed sentiment_stub
             try:
-                status = db_stub.SaveItems(iter(item_list))
+                status = db_stub.SaveItems(generate_scraped_items(loaded_plugins, linked_query_text, primary_query_id)) # Removed sentiment_stub
                 print(f"  Database service response for linked query: success={status.success}, items_saved={status.items_saved}")
             except grpc.RpcError as e:
                 print(f"  Could not connect to Database service for linked query: {e.details()}")
@@ -6,18 +6,20 @@ Integrates the complete Tokopedia scraper with the ScrapQT plugin system
 import sys
 import os
 import time
+import asyncio
 import re
-import hashlib
 import random
+import queue
 import threading
 from typing import List, Dict, Any, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, quote_plus
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add the project root to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 from src.scraper.base_scraper import BaseScraper
+from database_manager import generate_url_hash
 
 # Import Selenium components (these will only be imported when the plugin is actually used)
 try:
@@ -26,12 +28,93 @@ try:
     from selenium.webdriver.common.keys import Keys
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
     from webdriver_manager.chrome import ChromeDriverManager
     from bs4 import BeautifulSoup
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# lxml's C parser is much faster than the pure-Python html.parser on large pages
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Product pages are fetched over plain HTTP when aiohttp is installed;
+# otherwise extraction falls back to the pooled browsers
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Patterns used while extracting product fields, compiled once at import
+PRICE_STRIP_RE = re.compile(r'[^\d,.]')
+RATING_RE = re.compile(r'(\d+[.,]\d+|\d+)')
+# Captures the count and its unit suffix in lowercased text (e.g. "1,2rb" -> "1,2", "rb")
+REVIEW_COUNT_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*(rb|ribu|k|juta)?\b')
+REVIEW_COUNT_MULTIPLIERS = {'rb': 1000, 'ribu': 1000, 'k': 1000, 'juta': 1000000}
+KONDISI_RE = re.compile(r'Kondisi', re.IGNORECASE)
+
+# Anchors containing any of these are never product pages
+NON_PRODUCT_LINK_PATTERNS = (
+    '/search',
+    'ta.tokopedia.com',
+    'seller.tokopedia.com',
+    'help.tokopedia.com',
+    'blog.tokopedia.com',
+    '/help/',
+    '/blog/',
+    '/ta/',
+    '/edu/',
+    '/discovery/',  # Filter out discovery/promo pages
+)
+NON_PRODUCT_LINK_RE = re.compile('|'.join(map(re.escape, NON_PRODUCT_LINK_PATTERNS)))
+
+# Returns the hrefs of anchors from index arguments[0] onwards, so each scroll
+# pass only transfers the anchors added since the previous one
+COLLECT_HREFS_JS = "return Array.from(document.querySelectorAll('a')).slice(arguments[0]).map(a => a.href);"
+PAGE_HEIGHT_JS = "return document.body.scrollHeight;"
+# Requests matching these are blocked in the browser via the DevTools protocol
+BLOCKED_URL_PATTERNS = [
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*", "*facebook.net*", "*hotjar*",
+    "*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.svg", "*.mp4", "*.woff", "*.woff2",
+]
+# Visible, enabled homepage search box
+SEARCH_INPUT_SELECTOR = ', '.join(
+    f'{selector}:not([disabled]):not([hidden]):not([type="hidden"])'
+    for selector in (
+        'input[aria-label="Cari di Tokopedia"]',
+        'input[placeholder="Cari di Tokopedia"]',
+        'input[type="search"]',
+    )
+)
+# Present once search results have rendered
+RESULT_LINK_SELECTOR = 'a[href*="tokopedia.com/"]'
+
+# Product page field selectors (comma lists are matched in a single pass)
+TITLE_SELECTOR = '[data-testid="lblPDPDetailProductName"], h1[data-testid*="product"], h1'
+PRICE_SELECTOR = '[data-testid="lblPDPDetailProductPrice"], .price, [data-testid*="price"]'
+RATING_SELECTOR = '[data-testid="lblPDPDetailProductRatingNumber"], [data-testid*="rating"]'
+REVIEW_COUNT_SELECTOR = '[data-testid="lblPDPDetailProductRatingCounter"], [data-testid*="counter"]'
+DESCRIPTION_SELECTOR = '[data-testid="lblPDPDescriptionProduk"], .description'
+IMAGE_SELECTOR = 'img[data-testid*="PDPMainImage"], img[src*="images.tokopedia.net"]'
+KONDISI_SELECTOR = '[data-testid*="Kondisi"], [data-testid="lblPDPInfoProduk"]'
+
+# Maximum product pages fetched at once over HTTP
+HTTP_CONCURRENCY = 32
+
+# Browser-like headers so product pages are served the same HTML Chrome gets
+HTTP_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'),
+    'Accept-Language': 'id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
 
 class TokopediaScraper(BaseScraper):
     """
@@ -39,11 +122,27 @@ class TokopediaScraper(BaseScraper):
     Finds URLs + Extracts product data with parallel processing.
     """
     
-    def __init__(self, max_workers: int = 5):  # Reduced workers for plugin environment
+    MAX_USES_PER_DRIVER = 50  # Recycle pooled browsers after this many pages
+    POOL_WAIT_TIMEOUT = 30  # Seconds to wait for a pooled driver before starting a fresh one
+    
+    # ChromeDriver binary path, resolved once per process by _get_driver_path
+    _driver_path = None
+    _driver_path_lock = threading.Lock()
+    
+    def __init__(self, max_workers: int = 5, simulate_typing: bool = False):  # Reduced workers for plugin environment
         super().__init__()
         self.base_url = "https://www.tokopedia.com"
         self.max_workers = max_workers
+        self.simulate_typing = simulate_typing  # Type queries key by key, for bot-detection trouble
         self._lock = threading.Lock()  # Thread safety for progress updates
+        
+        # Pool of warm Chrome drivers shared by URL discovery and extraction.
+        # Filled lazily on first use so loading the plugin stays cheap.
+        self._pool = queue.Queue()
+        self._pool_lock = threading.Lock()
+        self._pool_size = 0  # Live drivers owned by the pool, idle or checked out
+        self._driver_uses = {}  # id(driver) -> pages served
+        self._closed = False  # Set by close(); released drivers are quit, not pooled
     
     @property
     def ecommerce_name(self) -> str:
@@ -56,6 +155,15 @@ class TokopediaScraper(BaseScraper):
             return False
         return True
     
+    @classmethod
+    def _get_driver_path(cls) -> str:
+        """Resolve the ChromeDriver binary once; later drivers reuse the cached path"""
+        if cls._driver_path is None:
+            with cls._driver_path_lock:
+                if cls._driver_path is None:
+                    cls._driver_path = ChromeDriverManager().install()
+        return cls._driver_path
+    
     def _setup_driver(self):
         """Setup hidden Chrome browser (invisible but not headless, like the original)"""
         if not self._check_dependencies():
@@ -68,9 +176,20 @@ class TokopediaScraper(BaseScraper):
             options.add_argument("--disable-blink-features=AutomationControlled")
             options.add_experimental_option("useAutomationExtension", False)
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            
-            service = Service(ChromeDriverManager().install())
+            # Only the DOM is scraped, so skip images, stylesheets and notifications
+            # and hand pages back as soon as the HTML has been parsed
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.stylesheets": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            options.page_load_strategy = 'eager'
+            
+            service = Service(self._get_driver_path())
             driver = webdriver.Chrome(service=service, options=options)
+            # Drop trackers, ads and media at the network layer
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
             driver.minimize_window()  # Minimize the window to make it invisible
             
             return driver
@@ -78,28 +197,99 @@ class TokopediaScraper(BaseScraper):
             print(f"Error setting up Chrome driver: {e}")
             return None
     
+    def _warm_pool(self, size: int):
+        """Start pooled Chrome drivers until the pool holds `size` of them"""
+        with self._pool_lock:
+            missing = size - self._pool_size
+            if missing <= 0 or self._closed:
+                return
+            # Chrome launches are independent, so start them all at once
+            with ThreadPoolExecutor(max_workers=missing) as executor:
+                drivers = list(executor.map(lambda _: self._setup_driver(), range(missing)))
+            # Count only the launches that worked, so failed ones are retried next time
+            for driver in drivers:
+                if driver:
+                    self._driver_uses[id(driver)] = 0
+                    self._pool.put(driver)
+                    self._pool_size += 1
+    
+    def _resize_pool(self, delta: int):
+        """Account for a driver joining or leaving the pool outside _warm_pool"""
+        with self._pool_lock:
+            self._pool_size += delta
+    
+    def _acquire_driver(self):
+        """Check a driver out of the pool, starting a fresh one if none could be warmed"""
+        # With aiohttp only URL discovery needs a browser; _extract_products_browser
+        # grows the pool to as many drivers as it has pages, up to max_workers
+        self._warm_pool(1 if AIOHTTP_AVAILABLE else self.max_workers)
+        if self._closed or (self._pool.empty() and not self._driver_uses):
+            driver = self._setup_driver()
+        else:
+            try:
+                return self._pool.get(timeout=self.POOL_WAIT_TIMEOUT)
+            except queue.Empty:
+                # A failed recycle can leave the pool short, so don't wait on it forever
+                driver = self._setup_driver()
+        if driver:
+            self._resize_pool(1)  # Joins the pool when released
+        return driver
+    
+    def _release_driver(self, driver):
+        """Return a driver to the pool, recycling it once it has served enough pages"""
+        if driver is None:
+            return
+        
+        key = id(driver)
+        uses = self._driver_uses.pop(key, 0) + 1
+        if self._closed:
+            # Nothing will empty the pool after close(), so don't leave Chrome running
+            self._quit_driver(driver)
+            self._resize_pool(-1)
+            return
+        if uses >= self.MAX_USES_PER_DRIVER:
+            self._quit_driver(driver)
+            driver = self._setup_driver()
+            if not driver:
+                self._resize_pool(-1)
+                return
+            key, uses = id(driver), 0
+        else:
+            try:
+                driver.delete_all_cookies()  # Isolate consecutive pages
+            except Exception:
+                self._quit_driver(driver)
+                driver = self._setup_driver()
+                if not driver:
+                    self._resize_pool(-1)
+                    return
+                key, uses = id(driver), 0
+        
+        self._driver_uses[key] = uses
+        self._pool.put(driver)
+    
+    def _quit_driver(self, driver):
+        """Quit a driver, ignoring errors from an already-dead browser"""
+        try:
+            driver.quit()
+        except:
+            pass
+    
+    def close(self):
+        """Quit every pooled driver; drivers still checked out are quit when released"""
+        with self._pool_lock:
+            self._closed = True
+            while not self._pool.empty():
+                driver = self._pool.get_nowait()
+                self._driver_uses.pop(id(driver), None)
+                self._quit_driver(driver)
+                self._pool_size -= 1
+    
     def _is_product_link(self, href: str) -> bool:
         """Check if URL is a product link"""
-        if not href or '/search' in href or 'ta.tokopedia.com' in href:
+        if not href or NON_PRODUCT_LINK_RE.search(href):
             return False
         
-        # Blacklist specific domains and paths
-        blacklisted_patterns = [
-            'seller.tokopedia.com',
-            'help.tokopedia.com',
-            'blog.tokopedia.com',
-            '/help/',
-            '/blog/',
-            '/ta/',
-            '/edu/',
-            '/discovery/'  # Filter out discovery/promo pages
-        ]
-        
-        # Check for blacklisted patterns
-        for pattern in blacklisted_patterns:
-            if pattern in href:
-                return False
-        
         if href.startswith('/'):
             href = urljoin(self.base_url, href)
         
@@ -109,41 +299,37 @@ class TokopediaScraper(BaseScraper):
         path_parts = [part for part in urlparse(href).path.split('/') if part]
         return len(path_parts) >= 2  # store-name/product-name pattern
     
+    def _wait_for(self, driver, condition, timeout: float = 8) -> bool:
+        """Wait until condition holds; returns False on timeout instead of raising"""
+        try:
+            WebDriverWait(driver, timeout).until(condition)
+            return True
+        except TimeoutException:
+            return False
+    
     def _search_homepage(self, driver, query: str) -> bool:
         """Search via homepage"""
         try:
             print(f"Searching Tokopedia homepage for: '{query}'")
             driver.get("https://www.tokopedia.com")
-            time.sleep(3)
-            
-            # Find search input
-            selectors = [
-                'input[aria-label="Cari di Tokopedia"]',
-                'input[placeholder="Cari di Tokopedia"]',
-                'input[type="search"]'
-            ]
-            
-            search_input = None
-            for selector in selectors:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if element.is_displayed() and element.is_enabled():
-                        search_input = element
-                        break
-                if search_input:
-                    break
             
-            if not search_input:
+            # Find search input; the selector itself skips hidden and disabled inputs
+            self._wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, SEARCH_INPUT_SELECTOR)))
+            search_inputs = driver.find_elements(By.CSS_SELECTOR, SEARCH_INPUT_SELECTOR)
+            if not search_inputs:
                 return False
+            search_input = search_inputs[0]
             
             # Type and submit
             search_input.clear()
-            for char in query:
-                search_input.send_keys(char)
-                time.sleep(0.05)
-            
-            search_input.send_keys(Keys.RETURN)
-            time.sleep(3)
+            if self.simulate_typing:
+                for char in query:
+                    search_input.send_keys(char)
+                    time.sleep(0.05)
+                search_input.send_keys(Keys.RETURN)
+            else:
+                search_input.send_keys(query + Keys.RETURN)
+            self._wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, RESULT_LINK_SELECTOR)))
             return True
             
         except Exception as e:
@@ -159,40 +345,37 @@ class TokopediaScraper(BaseScraper):
         driver = None
         
         try:
-            driver = self._setup_driver()
+            driver = self._acquire_driver()
             if not driver:
                 return []
                 
             print(f"Finding URLs for: '{query}' (max: {max_urls})")
             
-            # Search
-            if not self._search_homepage(driver, query):
-                # Fallback to direct URL
-                search_url = f"{self.base_url}/search?q={query.replace(' ', '+')}"
-                print(f"  Fallback to direct search: {search_url}")
-                driver.get(search_url)
-                time.sleep(3)
+            # Search by opening the results page directly
+            search_url = f"{self.base_url}/search?q={quote_plus(query)}"
+            driver.get(search_url)
+            if not self._wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, RESULT_LINK_SELECTOR))):
+                print("  Results page did not render, falling back to homepage search")
+                self._search_homepage(driver, query)
             
             # Scroll and collect URLs (reduced iterations for plugin efficiency)
             attempts = 0
+            seen_count = 0  # Anchors already collected on earlier passes
             while len(urls) < max_urls and attempts < 20:  # Reduced from 50 to 20
-                links = driver.find_elements(By.TAG_NAME, "a")
-                
-                for link in links:
-                    try:
-                        href = link.get_attribute("href")
-                        if href and self._is_product_link(href):
-                            urls.add(href)
-                    except:
-                        continue
+                # One WebDriver round trip for every new href on the page
+                hrefs = driver.execute_script(COLLECT_HREFS_JS, seen_count) or []
+                seen_count += len(hrefs)
+                urls.update(href for href in hrefs if self._is_product_link(href))
                 
                 if len(urls) >= max_urls:
                     break
                 
-                # Scroll for more
+                # Scroll for more, stopping once the page no longer grows
+                last_height = driver.execute_script(PAGE_HEIGHT_JS)
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
                 attempts += 1
+                if not self._wait_for(driver, lambda d: d.execute_script(PAGE_HEIGHT_JS) > last_height, timeout=5):
+                    break
             
             print(f"  Found {len(urls)} URLs")
             return list(urls)[:max_urls]
@@ -202,18 +385,14 @@ class TokopediaScraper(BaseScraper):
             return []
         
         finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+            self._release_driver(driver)
     
     def _clean_price(self, price_text: str) -> Optional[float]:
         """Extract numeric price from text"""
         if not price_text:
             return None
         
-        price_clean = re.sub(r'[^\d,.]', '', price_text)
+        price_clean = PRICE_STRIP_RE.sub('', price_text)
         price_clean = price_clean.replace(',', '').replace('.', '')
         
         try:
@@ -226,7 +405,7 @@ class TokopediaScraper(BaseScraper):
         if not rating_text:
             return None
         
-        rating_match = re.search(r'(\d+[.,]\d+|\d+)', rating_text)
+        rating_match = RATING_RE.search(rating_text)
         if rating_match:
             rating_str = rating_match.group(1).replace(',', '.')
             try:
@@ -240,182 +419,138 @@ class TokopediaScraper(BaseScraper):
         if not review_text:
             return None
         
-        count_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:rb|ribu|k|juta)?', review_text.lower())
+        count_match = REVIEW_COUNT_RE.search(review_text.lower())
         if count_match:
-            count_str = count_match.group(1)
+            count_str, suffix = count_match.groups()
             try:
-                count = float(count_str)
-                if 'rb' in review_text.lower() or 'ribu' in review_text.lower() or 'k' in review_text.lower():
-                    count *= 1000
-                elif 'juta' in review_text.lower():
-                    count *= 1000000
-                return int(count)
+                count = float(count_str.replace(',', '.'))
+                return int(count * REVIEW_COUNT_MULTIPLIERS.get(suffix, 1))
             except:
                 return None
         return None
     
+    def _url_hash(self, url: str) -> str:
+        """Short stable hash identifying a product URL"""
+        # Same key the database dedups products by
+        return generate_url_hash(url)
+    
+    def _parse_product(self, html: str, url: str, url_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Extract product data from a product page's HTML; raises if no title is found"""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        
+        product_data = {
+            'link': url,
+            'ecommerce': self.ecommerce_name,
+            'url_hash': url_hash or self._url_hash(url)
+        }
+        
+        # Each field is found with one combined selector, i.e. one tree walk;
+        # matches come back in document order
+        title_element = soup.select_one(TITLE_SELECTOR)
+        title = title_element.get_text(strip=True) if title_element else None
+        product_data['title'] = title or 'Unknown Product'
+        
+        # Extract price
+        price = None
+        for element in soup.select(PRICE_SELECTOR):
+            price = self._clean_price(element.get_text(strip=True))
+            if price:
+                break
+        
+        product_data['price'] = price or 0.0  # Use 0.0 instead of None
+        
+        # Extract rating and review count
+        review_score = None
+        for element in soup.select(RATING_SELECTOR):
+            review_score = self._extract_rating(element.get_text(strip=True))
+            if review_score:
+                break
+        
+        review_count = None
+        for element in soup.select(REVIEW_COUNT_SELECTOR):
+            review_count = self._extract_review_count(element.get_text(strip=True))
+            if review_count:
+                break
+        
+        product_data['review_score'] = review_score or 0.0  # Use 0.0 instead of None
+        product_data['review_count'] = review_count or 0  # Use 0 instead of None
+        
+        # Extract description
+        desc_element = soup.select_one(DESCRIPTION_SELECTOR)
+        description = desc_element.get_text(strip=True)[:500] if desc_element else None  # Limit description length
+        product_data['description'] = description or ''  # Use empty string instead of None
+        
+        # Extract image URL
+        img_element = soup.select_one(IMAGE_SELECTOR)
+        image_url = img_element.get('src') if img_element else None
+        product_data['image_url'] = image_url or ''  # Use empty string instead of None
+        
+        # Determine if used by checking "Kondisi" field
+        is_used = False
+        try:
+            # Only the product info block is searched, not the whole tree
+            kondisi_text = None
+            info_element = soup.select_one(KONDISI_SELECTOR)
+            if info_element:
+                label = info_element.find(string=KONDISI_RE)
+                kondisi_element = label.parent if label and label.parent else info_element
+                kondisi_text = kondisi_element.get_text(" ", strip=True).lower()
+            
+            if kondisi_text:
+                is_used = any(keyword in kondisi_text for keyword in ['bekas', 'second', 'preloved'])
+            else:
+                # Fallback to title/description search
+                title_lower = (title or '').lower()
+                desc_lower = (description or '').lower()
+                is_used = any(keyword in title_lower + ' ' + desc_lower for keyword in 
+                             ['bekas', 'second', 'preloved', 'used', 'seken'])
+                
+        except Exception:
+            # Final fallback
+            title_lower = (title or '').lower()
+            desc_lower = (description or '').lower()
+            is_used = any(keyword in title_lower + ' ' + desc_lower for keyword in 
+                         ['bekas', 'second', 'preloved', 'used', 'seken'])
+        
+        product_data['is_used'] = is_used
+        
+        # Validate that we got essential data
+        if not product_data['title'] or product_data['title'] == 'Unknown Product':
+            raise Exception("Failed to extract product title")
+        
+        return product_data
+    
+    def _page_html(self, driver) -> str:
+        """Serialize the current page through CDP, falling back to page_source"""
+        try:
+            response = driver.execute_cdp_cmd("Runtime.evaluate", {
+                "expression": "document.documentElement.outerHTML",
+                "returnByValue": True,
+            })
+            return response["result"]["value"]
+        except Exception:
+            return driver.page_source
+    
     def _extract_product_data(self, url: str, index: int = 0, total: int = 0) -> Dict[str, Any]:
-        """Extract product data from URL - thread-safe version"""
+        """Extract product data from URL with a pooled browser - thread-safe version"""
         if not self._check_dependencies():
             return self._create_error_product(url, "Dependencies not available")
         
+        url_hash = self._url_hash(url)  # Shared by the success and error paths
         driver = None
         try:
-            # Create separate driver instance for each thread
-            driver = self._setup_driver()
+            # Borrow a warm driver from the pool for this thread
+            driver = self._acquire_driver()
             if not driver:
-                return self._create_error_product(url, "Failed to setup driver")
+                return self._create_error_product(url, "Failed to setup driver", url_hash)
             
             with self._lock:
                 print(f"[{index}/{total}] Extracting: {url[:60]}...")
             
             driver.get(url)
-            time.sleep(2)  # Reduced sleep for efficiency
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            product_data = {
-                'link': url,
-                'ecommerce': self.ecommerce_name,
-                'url_hash': hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
-            }
-            
-            # Extract title
-            title_selectors = [
-                '[data-testid="lblPDPDetailProductName"]',
-                'h1[data-testid*="product"]',
-                'h1'
-            ]
-            
-            title = None
-            for selector in title_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    title = elements[0].get_text(strip=True)
-                    break
-            
-            product_data['title'] = title or 'Unknown Product'
-            
-            # Extract price
-            price_selectors = [
-                '[data-testid="lblPDPDetailProductPrice"]',
-                '.price',
-                '[data-testid*="price"]'
-            ]
-            
-            price = None
-            for selector in price_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    price_text = elements[0].get_text(strip=True)
-                    price = self._clean_price(price_text)
-                    if price:
-                        break
-            
-            product_data['price'] = price or 0.0  # Use 0.0 instead of None
-            
-            # Extract rating and review count
-            rating_selectors = [
-                '[data-testid="lblPDPDetailProductRatingNumber"]',
-                '[data-testid*="rating"]'
-            ]
-            
-            review_count_selectors = [
-                '[data-testid="lblPDPDetailProductRatingCounter"]', 
-                '[data-testid*="counter"]'
-            ]
-            
-            review_score = None
-            review_count = None
-            
-            for selector in rating_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    rating = self._extract_rating(text)
-                    if rating:
-                        review_score = rating
-                        break
-                if review_score:
-                    break
-            
-            for selector in review_count_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    count = self._extract_review_count(text)
-                    if count:
-                        review_count = count
-                        break
-                if review_count:
-                    break
-            
-            product_data['review_score'] = review_score or 0.0  # Use 0.0 instead of None
-            product_data['review_count'] = review_count or 0  # Use 0 instead of None
-            
-            # Extract description
-            desc_selectors = [
-                '[data-testid="lblPDPDescriptionProduk"]',
-                '.description'
-            ]
-            
-            description = None
-            for selector in desc_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    description = elements[0].get_text(strip=True)[:500]  # Limit description length
-                    break
-            
-            product_data['description'] = description or ''  # Use empty string instead of None
-            
-            # Extract image URL
-            img_selectors = [
-                'img[data-testid*="PDPMainImage"]',
-                'img[src*="images.tokopedia.net"]'
-            ]
-            
-            image_url = None
-            for selector in img_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    image_url = elements[0].get('src')
-                    break
-            
-            product_data['image_url'] = image_url or ''  # Use empty string instead of None
-            
-            # Determine if used by checking "Kondisi" field
-            is_used = False
-            try:
-                kondisi_elements = soup.find_all(string=re.compile(r'Kondisi', re.IGNORECASE))
-                
-                kondisi_text = None
-                for element in kondisi_elements:
-                    parent = element.parent
-                    if parent:
-                        kondisi_text = parent.get_text(strip=True).lower()
-                        break
-                
-                if kondisi_text:
-                    is_used = any(keyword in kondisi_text for keyword in ['bekas', 'second', 'preloved'])
-                else:
-                    # Fallback to title/description search
-                    title_lower = (title or '').lower()
-                    desc_lower = (description or '').lower()
-                    is_used = any(keyword in title_lower + ' ' + desc_lower for keyword in 
-                                 ['bekas', 'second', 'preloved', 'used', 'seken'])
-                    
-            except Exception:
-                # Final fallback
-                title_lower = (title or '').lower()
-                desc_lower = (description or '').lower()
-                is_used = any(keyword in title_lower + ' ' + desc_lower for keyword in 
-                             ['bekas', 'second', 'preloved', 'used', 'seken'])
+            self._wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, 'h1')))
             
-            product_data['is_used'] = is_used
-            
-            # Validate that we got essential data
-            if not product_data['title'] or product_data['title'] == 'Unknown Product':
-                raise Exception("Failed to extract product title")
+            product_data = self._parse_product(self._page_html(driver), url, url_hash)
             
             # Thread-safe progress update
             with self._lock:
@@ -428,22 +563,76 @@ class TokopediaScraper(BaseScraper):
             with self._lock:
                 print(f"    Error extracting {url[:50]}...: {error_msg}")
             
-            return self._create_error_product(url, error_msg)
+            return self._create_error_product(url, error_msg, url_hash)
         
         finally:
-            if driver:
+            self._release_driver(driver)
+    
+    async def _fetch_html(self, session, url: str) -> str:
+        """Download a product page's HTML"""
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.text()
+    
+    async def _extract_product_async(self, session, semaphore, url: str, index: int, total: int) -> Optional[Dict[str, Any]]:
+        """Fetch one product page and parse it off the event loop; returns None on failure"""
+        async with semaphore:
+            print(f"[{index}/{total}] Extracting: {url[:60]}...")
+            try:
+                html = await self._fetch_html(session, url)
+                # Parsing is CPU-bound, so keep it off the event loop
+                loop = asyncio.get_running_loop()
+                product_data = await loop.run_in_executor(None, self._parse_product, html, url)
+            except Exception as e:
+                print(f"    Error extracting {url[:50]}...: {e}")
+                return None
+        
+        print(f"    Success: {product_data['title'][:50]}...")
+        return product_data
+    
+    async def _scrape_async(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Extract all product pages over one HTTP session, at most HTTP_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+        connector = aiohttp.TCPConnector(limit=HTTP_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout per product
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HTTP_HEADERS) as session:
+            results = await asyncio.gather(*(
+                self._extract_product_async(session, semaphore, url, i+1, len(urls))
+                for i, url in enumerate(urls)
+            ))
+        return [product for product in results if product is not None]
+    
+    def _extract_products_browser(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Extract product pages in parallel with the pooled browsers, skipping failures"""
+        products = []
+        # A short retry list shouldn't start more browsers than it has pages
+        workers = max(1, min(self.max_workers, len(urls)))
+        self._warm_pool(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Submit all extraction tasks
+            future_to_url = {
+                executor.submit(self._extract_product_data, url, i+1, len(urls)): url 
+                for i, url in enumerate(urls)
+            }
+            
+            # Collect results as they complete
+            for future in as_completed(future_to_url):
                 try:
-                    driver.quit()
-                except:
-                    pass
+                    result = future.result(timeout=30)  # 30 second timeout per product
+                    # Only include successful products (filter out errors)
+                    if not result.get('scrape_error', False):
+                        products.append(result)
+                except Exception as e:
+                    print(f"Thread execution error: {e}")
+        return products
     
-    def _create_error_product(self, url: str, error_msg: str) -> Dict[str, Any]:
+    def _create_error_product(self, url: str, error_msg: str, url_hash: Optional[str] = None) -> Dict[str, Any]:
         """Create error product data for failed extractions"""
         return {
             'link': url,
             'ecommerce': self.ecommerce_name,
             'title': f'SCRAPE_ERROR: {error_msg[:100]}',
-            'url_hash': hashlib.sha256(url.encode('utf-8')).hexdigest()[:16],
+            'url_hash': url_hash or self._url_hash(url),
             'price': 0.0,  # Use 0.0 instead of None for compatibility
             'review_score': 0.0,
             'review_count': 0,
@@ -485,27 +674,26 @@ class TokopediaScraper(BaseScraper):
             
             # Step 2: Extract data in parallel
             print(f"\nPHASE 2: Extracting Product Data (Parallel)")
-            print(f"Using {self.max_workers} parallel workers...")
-            
-            all_products = []
             target_urls = urls[:max_products]  # Limit to requested amount
             
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all extraction tasks
-                future_to_url = {
-                    executor.submit(self._extract_product_data, url, i+1, len(target_urls)): url 
-                    for i, url in enumerate(target_urls)
-                }
+            if AIOHTTP_AVAILABLE:
+                print(f"Fetching {len(target_urls)} product pages over HTTP...")
+                all_products = asyncio.run(self._scrape_async(target_urls))
                 
-                # Collect results as they complete
-                for future in as_completed(future_to_url):
-                    try:
-                        result = future.result(timeout=30)  # 30 second timeout per product
-                        # Only include successful products (filter out errors)
-                        if not result.get('scrape_error', False):
-                            all_products.append(result)
-                    except Exception as e:
-                        print(f"Thread execution error: {e}")
+                # Retry the pages plain HTTP couldn't get with the browsers
+                # (Tokopedia may answer plain HTTP with a bot check or a JS-only shell)
+                extracted = {product['link'] for product in all_products}
+                failed_urls = [url for url in target_urls if url not in extracted]
+                if failed_urls:
+                    print(f"{len(failed_urls)} of {len(target_urls)} pages failed over HTTP, "
+                          f"retrying them with the browsers...")
+                    retried = self._extract_products_browser(failed_urls)
+                    all_products.extend(retried)
+                    if len(retried) < len(failed_urls):
+                        print(f"Dropped {len(failed_urls) - len(retried)} pages that failed in the browser too")
+            else:
+                print(f"Using {self.max_workers} parallel workers...")
+                all_products = self._extract_products_browser(target_urls)
             
             # Final summary
             elapsed = time.time() - start_time
@@ -535,7 +723,10 @@ if __name__ == "__main__":
     print(f"Testing {scraper.ecommerce_name} scraper...")
     
     test_query = "smartphone"
-    results = scraper.scrape(test_query)
+    try:
+        results = scraper.scrape(test_query)
+    finally:
+        scraper.close()
     
     print(f"\nTEST RESULTS:")
     print(f"Query: {test_query}")
@@ -1,4 +1,5 @@
 import grpc
+import atexit
 from concurrent import futures
 import time
 import os
@@ -20,43 +21,51 @@ class ScraperServicer(services_pb2_grpc.ScraperServicer):
         self.loaded_plugins = load_plugins(self.plugin_directory)
         print(f"Scraper server loaded {len(self.loaded_plugins)} plugins.")
 
+        # One long-lived channel to the integrated LLM+DB service; gRPC channels are
+        # thread-safe and multiplex concurrent RPCs over a single HTTP/2 connection
+        self.llm_db_channel = grpc.insecure_channel('localhost:60001')
+        self.llm_db_stub = services_pb2_grpc.SentimentStub(self.llm_db_channel)
+
+        # Quit plugin browsers even if the server exits without a KeyboardInterrupt
+        atexit.register(self.close)
+
+    def close(self):
+        """Releases the plugins' resources and the LLM+DB channel."""
+        for plugin in self.loaded_plugins:
+            try:
+                plugin.close()
+            except Exception as e:
+                print(f"  Could not close plugin {plugin.ecommerce_name}: {e}")
+        self.loaded_plugins = []
+        self.llm_db_channel.close()
+
     def Scrape(self, request, context):
         """Initiates a scraping task."""
         print(f"Scraper service received request to scrape: '{request.query}'")
         
-        llm_db_channel = None
+        # Save query and get query_id
         try:
-            # Establish gRPC channel to integrated LLM+DB service
-            llm_db_channel = grpc.insecure_channel('localhost:60001')
-            llm_db_stub = services_pb2_grpc.SentimentStub(llm_db_channel)
+            save_query_response = self.llm_db_stub.SaveQuery(services_pb2.SaveQueryRequest(query_text=request.query))
+            query_id = save_query_response.query_id
+            print(f"  Query '{request.query}' saved with ID: {query_id}")
+        except grpc.RpcError as e:
+            print(f"  Could not save query: {e.details()}")
+            query_id = 0 # Default to 0 if query cannot be saved
 
-            # Save query and get query_id
-            try:
-                save_query_response = llm_db_stub.SaveQuery(services_pb2.SaveQueryRequest(query_text=request.query))
-                query_id = save_query_response.query_id
-                print(f"  Query '{request.query}' saved with ID: {query_id}")
-            except grpc.RpcError as e:
-                print(f"  Could not save query: {e.details()}")
-                query_id = 0 # Default to 0 if query cannot be saved
-
-            # Generate scraped items and save to integrated LLM+DB service
-            item_list = list(generate_scraped_items(self.loaded_plugins, request.query, query_id))
-            
-            try:
-                status = llm_db_stub.SaveItems(iter(item_list))
-                print(f"  LLM+DB service response: success={status.success}, items_saved={status.items_saved}")
-                return services_pb2.ScrapeResponse(success=status.success, items_scraped=status.items_saved)
-            except grpc.RpcError as e:
-                print(f"  Could not connect to LLM+DB service: {e.details()}")
-                return services_pb2.ScrapeResponse(success=False, items_scraped=0)
-        finally:
-            if llm_db_channel:
-                llm_db_channel.close()
+        # Stream scraped items to the integrated LLM+DB service as they are produced
+        try:
+            status = self.llm_db_stub.SaveItems(generate_scraped_items(self.loaded_plugins, request.query, query_id))
+            print(f"  LLM+DB service response: success={status.success}, items_saved={status.items_saved}")
+            return services_pb2.ScrapeResponse(success=status.success, items_scraped=status.items_saved)
+        except grpc.RpcError as e:
+            print(f"  Could not connect to LLM+DB service: {e.details()}")
+            return services_pb2.ScrapeResponse(success=False, items_scraped=0)
 
 def serve():
     """Starts the gRPC server."""
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    services_pb2_grpc.add_ScraperServicer_to_server(ScraperServicer(), server)
+    servicer = ScraperServicer()
+    services_pb2_grpc.add_ScraperServicer_to_server(servicer, server)
     server.add_insecure_port('0.0.0.0:60002') # New port for Scraper Service
     server.start()
     print("Scraper gRPC server started on port 60002.")
@@ -65,6 +74,7 @@ def serve():
             time.sleep(86400) # One day
     except KeyboardInterrupt:
         server.stop(0)
+        servicer.close()
 
 if __name__ == '__main__':
     serve()
\ No newline at end of file